@@ -0,0 +1,152 @@
+from datetime import datetime
+from datetime import timedelta
+from decimal import Decimal
+from enum import Enum
+from typing import List
+from typing import Optional
+from typing import Union
+
+import cattr
+import pytest
+from attr import attrib
+from attr import dataclass
+from attr import make_class
+
+from cattrs_extras.converter import Converter
+from cattrs_extras.converter import ReversedEnum
+
+SIZES = [10, 1000]
+
+
+class Color(Enum):
+    RED = "red"
+    GREEN = "green"
+
+
+class ReversedColor(ReversedEnum):
+    RED = "red"
+    GREEN = "green"
+
+
+@dataclass(kw_only=True)
+class Flat:
+    int_value: int
+    str_value: str
+    float_value: float
+    bool_value: bool
+
+
+@dataclass(kw_only=True)
+class Nested:
+    name: str
+    items: List[Flat]
+    parent: Optional[Flat] = None
+
+
+@dataclass(kw_only=True)
+class Scalars:
+    price: Decimal
+    created: datetime
+    updated: datetime
+    ttl: timedelta
+    color: Color
+    reversed_color: ReversedColor
+
+
+EVENTS = [make_class(f"Event{i}", {"kind": attrib(type=str), f"field_{i}": attrib(type=int)}, kw_only=True) for i in range(20)]
+Event = Union[tuple(EVENTS)]  # type: ignore
+
+
+@dataclass(kw_only=True)
+class Events:
+    events: List[Event]  # type: ignore
+
+
+def make_flat(i: int) -> dict:
+    return {"int_value": i, "str_value": str(i), "float_value": i / 2, "bool_value": bool(i % 2)}
+
+
+def make_nested(i: int) -> dict:
+    return {"name": str(i), "items": [make_flat(j) for j in range(5)], "parent": make_flat(i)}
+
+
+def make_scalars(i: int) -> dict:
+    return {
+        "price": f"{i}.99",
+        "created": "2020-04-02T12:00:00",
+        "updated": 1585818000.0 + i,
+        "ttl": "1h30m",
+        "color": "red",
+        "reversed_color": "GREEN",
+    }
+
+
+def make_events(size: int) -> dict:
+    return {"events": [{"kind": "event", f"field_{i % 20}": i} for i in range(size)]}
+
+
+@pytest.fixture(params=["cattrs_extras", "cattrs_extras_frozen", "cattrs"])
+def converter(request):
+    if request.param == "cattrs":
+        return cattr.Converter()
+    converter = Converter()
+    if request.param == "cattrs_extras_frozen":
+        converter.freeze(List[Flat], List[Nested], Events)
+    return converter
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_structure_flat(benchmark, converter, size):
+    benchmark.group = f"structure-flat-{size}"
+    data = [make_flat(i) for i in range(size)]
+    benchmark(converter.structure, data, List[Flat])
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_unstructure_flat(benchmark, converter, size):
+    benchmark.group = f"unstructure-flat-{size}"
+    objs = Converter().structure([make_flat(i) for i in range(size)], List[Flat])
+    benchmark(converter.unstructure, objs)
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_structure_nested(benchmark, converter, size):
+    benchmark.group = f"structure-nested-{size}"
+    data = [make_nested(i) for i in range(size)]
+    benchmark(converter.structure, data, List[Nested])
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_unstructure_nested(benchmark, converter, size):
+    benchmark.group = f"unstructure-nested-{size}"
+    objs = Converter().structure([make_nested(i) for i in range(size)], List[Nested])
+    benchmark(converter.unstructure, objs)
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_structure_union(benchmark, converter, size):
+    benchmark.group = f"structure-union-{size}"
+    data = make_events(size)
+    benchmark(converter.structure, data, Events)
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_structure_scalars(benchmark, size):
+    benchmark.group = f"structure-scalars-{size}"
+    data = [make_scalars(i) for i in range(size)]
+    benchmark(Converter().structure, data, List[Scalars])
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_unstructure_scalars(benchmark, size):
+    benchmark.group = f"unstructure-scalars-{size}"
+    converter = Converter()
+    objs = converter.structure([make_scalars(i) for i in range(size)], List[Scalars])
+    benchmark(converter.unstructure, objs)
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_structure_many(benchmark, size):
+    benchmark.group = f"structure-flat-{size}"
+    data = [make_flat(i) for i in range(size)]
+    benchmark(Converter().structure_many, data, Flat)
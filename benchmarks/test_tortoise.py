@@ -0,0 +1,73 @@
+from datetime import datetime
+from decimal import Decimal
+from typing import List
+
+import pytest
+from tortoise import fields  # type: ignore
+
+from benchmarks.test_converter import SIZES
+from benchmarks.test_converter import Color
+from benchmarks.test_converter import ReversedColor
+from cattrs_extras.tortoise.converter import TortoiseConverter
+from cattrs_extras.tortoise.fields import ReversedCharEnumField
+from cattrs_extras.tortoise.model import Model
+
+
+class Customer(Model):
+    id = fields.IntField(pk=True)
+    name = fields.CharField(255)
+
+
+class Order(Model):
+    id = fields.IntField(pk=True)
+    price = fields.DecimalField(20, 2)
+    created = fields.DatetimeField()
+    ttl = fields.TimeDeltaField(null=True)
+    color = fields.CharEnumField(Color)
+    reversed_color = ReversedCharEnumField(ReversedColor)
+    paid = fields.BooleanField(default=False)
+    customer = fields.ForeignKeyField("models.Customer", related_name="orders", null=True)
+
+
+def make_order(i: int) -> dict:
+    return {
+        "id": i,
+        "price": f"{i}.99",
+        "created": "2020-04-02T12:00:00",
+        "ttl": 3600,
+        "color": "red",
+        "reversed_color": "GREEN",
+        "paid": True,
+        "customer": {"id": i, "name": str(i)},
+    }
+
+
+@pytest.fixture
+def converter():
+    return TortoiseConverter(__name__)
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_structure_models(benchmark, converter, size):
+    benchmark.group = f"structure-tortoise-{size}"
+    data = [make_order(i) for i in range(size)]
+    benchmark(converter.structure, data, List[Order])
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_unstructure_models(benchmark, converter, size):
+    benchmark.group = f"unstructure-tortoise-{size}"
+    customer = Customer(id=1, name="customer")
+    customer._saved_in_db = True
+    objs = [
+        Order(
+            id=i,
+            price=Decimal("1.99"),
+            created=datetime(2020, 4, 2),
+            color=Color.RED,
+            reversed_color=ReversedColor.GREEN,
+            customer=customer,
+        )
+        for i in range(size)
+    ]
+    benchmark(converter.unstructure, objs)
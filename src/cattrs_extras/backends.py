@@ -0,0 +1,116 @@
+import json
+from datetime import date
+from datetime import datetime
+from decimal import Decimal
+from typing import Any
+from typing import Dict
+from typing import Tuple
+from typing import Type
+from typing import Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore
+
+try:
+    import msgpack  # type: ignore
+except ImportError:  # pragma: no cover
+    msgpack = None
+
+# NOTE: Application-specific msgpack extension types; -1 is reserved by msgpack for timezone-aware timestamps
+MSGPACK_EXT_NAIVE_DATETIME = 1
+MSGPACK_EXT_DATE = 2
+MSGPACK_EXT_DECIMAL = 3
+
+
+class Backend:
+    """Serialization backend used by `Converter.dumps` and `Converter.loads`.
+
+    Types listed in `passthrough` are serialized natively by backend and are left untouched on unstructuring. `jsonl` is
+    set when output of `dumps` can be used as a line of JSON Lines stream.
+    """
+
+    name = "json"
+    passthrough: Tuple[Type, ...] = ()
+    jsonl = True
+
+    def dumps(self, obj: Any) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode()
+
+    def loads(self, data: Union[str, bytes]) -> Any:
+        return json.loads(data)
+
+
+class OrjsonBackend(Backend):
+    """orjson backend; datetime and date objects are serialized to RFC 3339 strings by orjson itself."""
+
+    name = "orjson"
+    passthrough = (datetime, date)
+
+    def __init__(self) -> None:
+        if orjson is None:
+            raise ImportError("orjson is not installed; install `cattrs-extras[orjson]` to use this backend")
+
+    def dumps(self, obj: Any) -> bytes:
+        return orjson.dumps(obj)
+
+    def loads(self, data: Union[str, bytes]) -> Any:
+        return orjson.loads(data)
+
+
+class MsgpackBackend(Backend):
+    """msgpack backend; datetime, date and Decimal objects are packed as extension types.
+
+    Timezone-aware datetimes use msgpack timestamp type and are unpacked in UTC.
+    """
+
+    name = "msgpack"
+    passthrough = (datetime, date, Decimal)
+    jsonl = False
+
+    def __init__(self) -> None:
+        if msgpack is None:
+            raise ImportError("msgpack is not installed; install `cattrs-extras[msgpack]` to use this backend")
+
+    def dumps(self, obj: Any) -> bytes:
+        return msgpack.packb(obj, default=_msgpack_default)
+
+    def loads(self, data: Union[str, bytes]) -> Any:
+        return msgpack.unpackb(data, timestamp=3, ext_hook=_msgpack_ext_hook)
+
+
+def _msgpack_default(obj: Any) -> Any:
+    if isinstance(obj, datetime):
+        if obj.tzinfo is None:
+            return msgpack.ExtType(MSGPACK_EXT_NAIVE_DATETIME, obj.isoformat().encode())
+        return msgpack.Timestamp.from_datetime(obj)
+    if isinstance(obj, date):
+        return msgpack.ExtType(MSGPACK_EXT_DATE, obj.isoformat().encode())
+    if isinstance(obj, Decimal):
+        return msgpack.ExtType(MSGPACK_EXT_DECIMAL, str(obj).encode())
+    raise TypeError(f"Object of type {obj.__class__.__name__} is not msgpack serializable")
+
+
+def _msgpack_ext_hook(code: int, data: bytes) -> Any:
+    if code == MSGPACK_EXT_NAIVE_DATETIME:
+        return datetime.fromisoformat(data.decode())
+    if code == MSGPACK_EXT_DATE:
+        return date.fromisoformat(data.decode())
+    if code == MSGPACK_EXT_DECIMAL:
+        return Decimal(data.decode())
+    return msgpack.ExtType(code, data)
+
+
+BACKENDS: Dict[str, Type[Backend]] = {
+    Backend.name: Backend,
+    OrjsonBackend.name: OrjsonBackend,
+    MsgpackBackend.name: MsgpackBackend,
+}
+
+
+def get_backend(name: str) -> Backend:
+    try:
+        return BACKENDS[name]()
+    except KeyError as exc:
+        raise ValueError(f"Unsupported backend: {name}") from exc
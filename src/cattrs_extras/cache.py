@@ -0,0 +1,113 @@
+import time
+from collections import OrderedDict
+from functools import wraps
+from typing import Any
+from typing import Callable
+from typing import Optional
+from typing import Tuple
+
+CacheKey = Tuple[Any, Any]
+
+
+class CacheStats:
+    """Counters of a scalar cache; `size` is the number of entries at the moment of snapshot."""
+
+    __slots__ = ("hits", "misses", "evictions", "expirations", "size")
+
+    def __init__(self, hits: int = 0, misses: int = 0, evictions: int = 0, expirations: int = 0, size: int = 0) -> None:
+        self.hits = hits
+        self.misses = misses
+        self.evictions = evictions
+        self.expirations = expirations
+        self.size = size
+
+    def __repr__(self) -> str:
+        return (
+            f"CacheStats(hits={self.hits}, misses={self.misses}, evictions={self.evictions}, "
+            f"expirations={self.expirations}, size={self.size})"
+        )
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, CacheStats):
+            return NotImplemented
+        return (self.hits, self.misses, self.evictions, self.expirations, self.size) == (
+            other.hits,
+            other.misses,
+            other.evictions,
+            other.expirations,
+            other.size,
+        )
+
+
+class ScalarCache:
+    """LRU cache of structured values keyed by type and raw value, shared by all structure hooks wrapped with it.
+
+    Only hooks returning immutable objects may be wrapped, since the same object is returned for every equal raw value.
+    Only raw values of exactly `str` and `int` classes are cached: equal values of other classes may structure to
+    different results, e.g. `Decimal("1.0")` and `Decimal("1.00")`, `0.0` and `-0.0` or aware datetimes of the same
+    instant in different timezones, so they are passed to the hook as is. With `ttl` set entries older than `ttl` seconds
+    are dropped on access, which matters for values depending on current time like dateutil filling missing date parts
+    with today. Counters are not synchronized; use a separate converter per thread to get exact stats.
+    """
+
+    def __init__(self, maxsize: int, ttl: Optional[float] = None) -> None:
+        if maxsize < 1:
+            raise ValueError("Cache size must be positive")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[CacheKey, Tuple[Any, float]]" = OrderedDict()
+        self._stats = CacheStats()
+
+    def wrap(self, handler: Callable[[Any, Any], Any]) -> Callable[[Any, Any], Any]:
+        entries = self._entries
+        stats = self._stats
+        maxsize = self.maxsize
+        ttl = self.ttl
+        monotonic = time.monotonic
+
+        @wraps(handler)
+        def _cached(obj: Any, cl: Any) -> Any:
+            obj_cls = obj.__class__
+            if obj_cls is not str and obj_cls is not int:
+                return handler(obj, cl)
+            key = (cl, obj)
+            try:
+                value, expires_at = entries[key]
+            except KeyError:
+                pass
+            else:
+                if ttl is None or expires_at > monotonic():
+                    stats.hits += 1
+                    # NOTE: Entry may be evicted by another thread in the meantime
+                    try:
+                        entries.move_to_end(key)
+                    except KeyError:
+                        pass
+                    return value
+                stats.expirations += 1
+                entries.pop(key, None)
+
+            stats.misses += 1
+            value = handler(obj, cl)
+            entries[key] = value, 0.0 if ttl is None else monotonic() + ttl
+            if len(entries) > maxsize:
+                try:
+                    entries.popitem(last=False)
+                    stats.evictions += 1
+                except KeyError:
+                    pass
+            return value
+
+        _cached.__wrapped__ = handler  # type: ignore
+        return _cached
+
+    def snapshot(self) -> CacheStats:
+        stats = self._stats
+        return CacheStats(stats.hits, stats.misses, stats.evictions, stats.expirations, len(self._entries))
+
+    def reset(self) -> None:
+        stats = self._stats
+        stats.hits, stats.misses, stats.evictions, stats.expirations = 0, 0, 0, 0
+
+    def clear(self) -> None:
+        self._entries.clear()
@@ -0,0 +1,229 @@
+from datetime import date
+from datetime import datetime
+from datetime import timedelta
+from datetime import timezone
+from decimal import Decimal
+from enum import Enum
+from functools import partial
+from itertools import repeat
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import NamedTuple
+from typing import Optional
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None  # type: ignore
+
+ColumnBuilder = Callable[[List[Any]], Any]
+ColumnParser = Callable[[Any], List[Any]]
+
+_utc_fromtimestamp = partial(datetime.fromtimestamp, tz=timezone.utc)
+
+
+class Categorical(NamedTuple):
+    """Enum column: `codes` are indexes of unstructured members in `categories`, -1 stands for None.
+
+    Same layout as `pandas.Categorical.from_codes(codes, categories)` expects.
+    """
+
+    codes: Any
+    categories: List[Any]
+
+
+def make_column_builder(type_: Any, optional: bool, unstructure: Optional[Callable[[Any], Any]]) -> ColumnBuilder:
+    """Get a function converting a list of field values to a numpy array in a single pass.
+
+    `type_` is a field type without Optional; `unstructure` is its hook, None if values are left as is. Datetimes, dates
+    and timedeltas become `datetime64` and `timedelta64` arrays with NaT for None, timezone-aware datetimes are converted
+    to UTC. Integers, floats and booleans get native dtypes; integer and boolean columns containing None fall back to
+    object arrays. Enums become `Categorical` columns, everything else object arrays of unstructured values.
+    """
+    if numpy is None:
+        raise ImportError("numpy is not installed; install `cattrs-extras[numpy]` to unstructure columns")
+
+    if type_ is datetime:
+        return _datetime_column
+    if type_ is date:
+        return _make_array_builder("datetime64[D]", optional)
+    if type_ is timedelta:
+        return _make_array_builder("timedelta64[us]", optional)
+    if type_ is float:
+        return _make_array_builder("float64", optional)
+    if type_ is bool:
+        return _make_array_builder("bool", optional, nullable=False)
+    if type_ is int:
+        return _make_array_builder("int64", optional, nullable=False)
+    if isinstance(type_, type) and issubclass(type_, Enum) and unstructure is not None:
+        return _make_categorical_builder(type_, unstructure)
+    return _make_object_builder(optional, unstructure)
+
+
+def _datetime_column(values: List[Any]) -> Any:
+    # NOTE: datetime64 has no timezones; numpy warns on aware values
+    if any(v is not None and v.tzinfo is not None for v in values):
+        values = [v if v is None or v.tzinfo is None else v.astimezone(timezone.utc).replace(tzinfo=None) for v in values]
+    return numpy.array(values, dtype="datetime64[us]")
+
+
+def _make_array_builder(dtype: str, optional: bool, nullable: bool = True) -> ColumnBuilder:
+    if nullable or not optional:
+        return lambda values: numpy.array(values, dtype=dtype)
+
+    def _nullable_column(values: List[Any]) -> Any:
+        if None in values:
+            return numpy.fromiter(values, dtype=object, count=len(values))
+        return numpy.array(values, dtype=dtype)
+
+    return _nullable_column
+
+
+def _make_categorical_builder(enum_type: Any, unstructure: Callable[[Any], Any]) -> ColumnBuilder:
+    categories = [unstructure(member) for member in enum_type]
+    codes = {member: i for i, member in enumerate(enum_type)}
+    codes[None] = -1
+    get_code = codes.__getitem__
+
+    def _categorical_column(values: List[Any]) -> Categorical:
+        try:
+            return Categorical(numpy.fromiter(map(get_code, values), dtype=numpy.int32, count=len(values)), categories)
+        except KeyError as exc:
+            raise ValueError(f"{exc.args[0]!r} is not a member of {enum_type.__qualname__}") from None
+
+    return _categorical_column
+
+
+def _make_object_builder(optional: bool, unstructure: Optional[Callable[[Any], Any]]) -> ColumnBuilder:
+    # NOTE: `fromiter` keeps every item a scalar; `numpy.array` would turn lists of equal length into a 2D array
+    if unstructure is None:
+        return lambda values: numpy.fromiter(values, dtype=object, count=len(values))
+    if not optional:
+        hook = unstructure
+        return lambda values: numpy.fromiter(map(hook, values), dtype=object, count=len(values))
+
+    def _unstructure_optional(value: Any) -> Any:
+        return None if value is None else unstructure(value)  # type: ignore
+
+    return lambda values: numpy.fromiter(map(_unstructure_optional, values), dtype=object, count=len(values))
+
+
+def make_column_parser(
+    type_: Any,
+    optional: bool,
+    hook: Optional[Callable[[Any, Any], Any]],
+    hook_type: Any,
+    vectorize: bool,
+) -> ColumnParser:
+    """Get a function converting a column to a list of structured values; the mirror of `make_column_builder`.
+
+    Columns are numpy arrays, `Categorical` columns or any other sequences. `type_` is a field type without Optional,
+    `hook` is its structure hook called with `hook_type`, None if values are taken as is. With `vectorize` set the hook
+    is a built-in one, so whole columns are converted at once where possible: datetime64 and timedelta64 arrays, numeric
+    epoch timestamps, numpy string arrays of decimals and enum values, which are structured once per distinct value.
+    Values the fast path can't handle are structured one by one, so invalid values are reported by hooks as usual. NaN
+    values of optional float fields become None. Datetimes are UTC-aware, the same as ones parsed from epoch timestamps.
+    """
+    convert = _FAST_CONVERTERS.get(type_) if vectorize else None
+    lookup_distinct = vectorize and isinstance(type_, type) and issubclass(type_, Enum)
+    nan_is_none = optional and type_ is float
+
+    def _parse_column(column: Any) -> List[Any]:
+        if isinstance(column, Categorical):
+            categories = column.categories
+            column = [None if code < 0 else categories[code] for code in _to_list(column.codes)]
+
+        if convert is not None:
+            try:
+                values = convert(column)
+            except Exception:  # pylint: disable=broad-except
+                values = None
+            if values is not None and (optional or None not in values):
+                return values
+
+        if nan_is_none and numpy is not None and isinstance(column, numpy.ndarray) and column.dtype.kind == "f":
+            # NOTE: The mirror of `make_column_builder` storing None as NaN in float columns
+            nan_mask = numpy.isnan(column)
+            column = column.astype(object)
+            column[nan_mask] = None
+        values = _to_list(column)
+        if hook is None:
+            return values
+        if lookup_distinct:
+            structured = {value: hook(value, hook_type) for value in set(values)}
+            return list(map(structured.__getitem__, values))
+        return list(map(hook, values, repeat(hook_type)))
+
+    return _parse_column
+
+
+def arrow_to_columns(batch: Any) -> Dict[str, Any]:
+    """Get columns of an Arrow record batch or table by name in a form `make_column_parser` converts at once.
+
+    Timestamp, date and duration columns become datetime64 and timedelta64 arrays with NaT for nulls, other columns
+    without nulls become numpy arrays. Other columns with nulls become lists, since numpy turns integers with nulls into
+    floats.
+    """
+    if numpy is None:
+        return batch.to_pydict()
+
+    import pyarrow.types  # type: ignore  # pylint: disable=import-outside-toplevel
+
+    columns = {}
+    for name, column in zip(batch.schema.names, batch.columns):
+        type_ = column.type
+        if column.null_count and not (
+            pyarrow.types.is_timestamp(type_) or pyarrow.types.is_date(type_) or pyarrow.types.is_duration(type_)
+        ):
+            columns[name] = column.to_pylist()
+        else:
+            columns[name] = column.to_numpy(zero_copy_only=False)
+    return columns
+
+
+def _to_list(column: Any) -> List[Any]:
+    if isinstance(column, list):
+        return column
+    if numpy is not None and isinstance(column, numpy.ndarray):
+        return column.tolist()
+    return list(column)
+
+
+def _datetime_values(column: Any) -> Optional[List[Any]]:
+    if numpy is not None and isinstance(column, numpy.ndarray):
+        if column.dtype.kind == "M":
+            # NOTE: datetime64 values are UTC, the same as epoch timestamps
+            return [None if value is None else value.replace(tzinfo=timezone.utc) for value in column.astype("datetime64[us]").tolist()]
+        if column.dtype.kind not in "iuf":
+            return None
+    # NOTE: Epoch timestamps; strings make `fromtimestamp` fail and are left to the hook
+    return list(map(_utc_fromtimestamp, _to_list(column)))
+
+
+def _date_values(column: Any) -> Optional[List[Any]]:
+    if numpy is not None and isinstance(column, numpy.ndarray) and column.dtype.kind == "M":
+        return column.astype("datetime64[D]").tolist()
+    return None
+
+
+def _timedelta_values(column: Any) -> Optional[List[Any]]:
+    if numpy is not None and isinstance(column, numpy.ndarray) and column.dtype.kind == "m":
+        return column.astype("timedelta64[us]").tolist()
+    return None
+
+
+def _decimal_values(column: Any) -> Optional[List[Any]]:
+    # NOTE: Floats are left to the hook converting them via `str`
+    if numpy is not None and isinstance(column, numpy.ndarray) and column.dtype.kind in "Uiu":
+        return list(map(Decimal, column.tolist()))
+    return None
+
+
+_FAST_CONVERTERS: Dict[Any, Callable[[Any], Optional[List[Any]]]] = {
+    datetime: _datetime_values,
+    date: _date_values,
+    timedelta: _timedelta_values,
+    Decimal: _decimal_values,
+}
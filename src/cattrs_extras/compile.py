@@ -0,0 +1,179 @@
+"""Generate a module of structuring and unstructuring functions ahead of time.
+
+Usage: `python -m cattrs_extras.compile myapp.models [myapp.other_models ...] -o myapp/compiled.py`, then call
+`converter.load_compiled('myapp.compiled')` right after the converter is created. Functions are generated for every attrs
+class and Tortoise model defined in given modules and for every type reachable from them. Tortoise models are initialized
+with an in-memory SQLite database under the `models` app label first, since initialization adds relation fields.
+
+Generated functions are identified by a hash of their source, so a function is used at runtime only when the converter
+would generate exactly the same code itself; otherwise it's compiled dynamically as usual. The converter still generates
+and hashes sources at runtime to find the function and to bind hooks it references, so loading a module saves
+compilation time only, not code generation.
+"""
+import argparse
+import asyncio
+import importlib
+import importlib.util
+import sys
+from contextlib import suppress
+from types import ModuleType
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+from attr import has
+
+from cattrs_extras.converter import Converter
+from cattrs_extras.converter import StructureError
+
+Sources = Dict[str, Tuple[str, str]]
+
+
+def _is_tortoise_model(cls: Any) -> bool:
+    with suppress(ImportError):
+        from cattrs_extras.tortoise.converter import _is_tortoise_model as is_tortoise_model
+
+        return is_tortoise_model(cls)
+    return False
+
+
+def find_roots(modules: List[ModuleType]) -> List[Any]:
+    """Get attrs classes and Tortoise models defined in modules."""
+    roots = []
+    for module in modules:
+        for value in vars(module).values():
+            if not isinstance(value, type) or value.__module__ != module.__name__:
+                continue
+            if has(value) or _is_tortoise_model(value):
+                roots.append(value)
+    return roots
+
+
+def init_tortoise(modules: List[ModuleType]) -> None:
+    """Initialize Tortoise models with an in-memory database to get the same fields as at runtime."""
+    from tortoise import Tortoise
+
+    async def _init() -> None:
+        await Tortoise.init(db_url="sqlite://:memory:", modules={"models": [module.__name__ for module in modules]})
+        await Tortoise.close_connections()
+
+    asyncio.run(_init())
+
+
+def make_converter(modules: List[ModuleType], roots: List[Any], collect_errors: bool = False) -> Converter:
+    """Create `TortoiseConverter` for modules containing Tortoise models, `Converter` otherwise."""
+    if any(_is_tortoise_model(root) for root in roots):
+        from cattrs_extras.tortoise.converter import TortoiseConverter
+
+        return TortoiseConverter({"models": [module.__name__ for module in modules]}, collect_errors=collect_errors)
+    return Converter(collect_errors=collect_errors)
+
+
+def generate_sources(converter: Converter, roots: List[Any]) -> Sources:
+    """Generate functions for all types reachable from roots; returns function names and sources by source hash."""
+    if converter._frozen:
+        raise RuntimeError("Converter is frozen, functions can't be generated")
+
+    sources: Sources = {}
+    converter._generated_sources = sources
+    try:
+        for dispatcher in (converter._structure_func, converter._unstructure_func):
+            dispatcher.dispatch.cache_clear()
+            for type_ in converter._get_reachable_types(roots):
+                with suppress(StructureError):
+                    dispatcher.dispatch(type_)
+    finally:
+        converter._generated_sources = None
+    return sources
+
+
+def render_module(sources: Sources, command: str) -> str:
+    lines = [
+        f'"""Generated with `{command}`, do not edit.',
+        "",
+        "Load with `Converter.load_compiled` method.",
+        '"""',
+        "# flake8: noqa",
+        "# mypy: ignore-errors",
+        "# fmt: off",
+        "",
+        "FUNCTIONS = {}",
+    ]
+    for key, (fn_name, source) in sorted(sources.items(), key=lambda item: (item[1][0], item[0])):
+        lines.extend(["", "", source, f"FUNCTIONS[{key!r}] = {fn_name}"])
+    lines.append("")
+    return "\n".join(lines)
+
+
+def check_module(module: ModuleType, sources: Sources, converter: Converter, roots: List[Any]) -> List[str]:
+    """Compare functions of generated module with the ones generated dynamically by a fresh converter.
+
+    Returns a list of problems; an empty list means that the module is equivalent to dynamic code generation.
+    """
+    problems = []
+    dynamic_sources = generate_sources(converter, roots)
+    for key, (fn_name, source) in dynamic_sources.items():
+        function = module.FUNCTIONS.get(key)
+        if function is None:
+            problems.append(f"{fn_name}: missing in compiled module")
+            continue
+        expected = compile(source, "<dynamic>", "exec")
+        code = next(c for c in expected.co_consts if hasattr(c, "co_code"))
+        actual = function.__code__
+        if (code.co_code, code.co_names, code.co_varnames, code.co_consts) != (
+            actual.co_code,
+            actual.co_names,
+            actual.co_varnames,
+            actual.co_consts,
+        ):
+            problems.append(f"{fn_name}: compiled code differs from dynamic one")
+    for key in set(sources) - set(dynamic_sources):
+        problems.append(f"{sources[key][0]}: not generated dynamically")
+    return problems
+
+
+def _import_path(path: str) -> ModuleType:
+    spec = importlib.util.spec_from_file_location("_cattrs_extras_compiled", path)
+    module = importlib.util.module_from_spec(spec)  # type: ignore
+    spec.loader.exec_module(module)  # type: ignore
+    return module
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m cattrs_extras.compile", description=__doc__.split("\n")[0])
+    parser.add_argument("modules", nargs="+", help="modules with attrs classes and Tortoise models")
+    parser.add_argument("-o", "--output", help="path of module to write, stdout if not set")
+    parser.add_argument("--collect-errors", action="store_true", help="generate code for converters with `collect_errors` enabled")
+    parser.add_argument("--no-tortoise-init", action="store_true", help="don't initialize Tortoise models with in-memory database")
+    parser.add_argument("--no-check", action="store_true", help="don't check generated module against dynamic code generation")
+    args = parser.parse_args(argv)
+
+    modules = [importlib.import_module(name) for name in args.modules]
+    roots = find_roots(modules)
+    if not args.no_tortoise_init and any(_is_tortoise_model(root) for root in roots):
+        init_tortoise(modules)
+    sources = generate_sources(make_converter(modules, roots, args.collect_errors), roots)
+    command = " ".join(["python -m cattrs_extras.compile", *(argv if argv is not None else sys.argv[1:])])
+    text = render_module(sources, command)
+
+    if args.output is None:
+        sys.stdout.write(text)
+        return 0
+
+    with open(args.output, "w") as file:
+        file.write(text)
+
+    if not args.no_check:
+        problems = check_module(_import_path(args.output), sources, make_converter(modules, roots, args.collect_errors), roots)
+        if problems:
+            sys.stderr.write("".join(f"{problem}\n" for problem in problems))
+            return 1
+
+    sys.stderr.write(f"{len(sources)} functions written to {args.output}\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
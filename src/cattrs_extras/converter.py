@@ -1,26 +1,86 @@
-import sys
+import collections.abc
+import importlib
+import inspect
+import io
+import linecache
+from collections import OrderedDict
+from concurrent.futures import Executor
+from concurrent.futures import Future
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
 from contextlib import suppress
 from datetime import date
 from datetime import datetime
 from datetime import timedelta
 from datetime import timezone
+from decimal import Context
 from decimal import Decimal
+from decimal import InvalidOperation
 from enum import Enum
+from functools import lru_cache
+from functools import partial
+from hashlib import blake2b
+from itertools import count
+from itertools import islice
+from operator import attrgetter
+from types import CodeType
+from types import FunctionType
+from types import ModuleType
+from typing import IO
 from typing import Any
 from typing import Callable
+from typing import Dict
+from typing import ForwardRef
+from typing import Iterable
+from typing import Iterator
+from typing import List
 from typing import Mapping
+from typing import NamedTuple
+from typing import Optional
+from typing import Set
+from typing import Tuple
 from typing import Type
 from typing import TypeVar
+from typing import Union
+from typing import get_type_hints
+from uuid import uuid4
 
 import cattr
-import dateutil.parser
+from attr import NOTHING
+from attr import Attribute
+from attr import Factory
 from attr import fields
-from pytimeparse.timeparse import timeparse  # type: ignore
+from attr import has
+from typing_extensions import Literal
 from typing_extensions import get_args
+from typing_extensions import get_origin
+
+from cattrs_extras.backends import Backend
+from cattrs_extras.backends import get_backend
+from cattrs_extras.cache import CacheStats
+from cattrs_extras.cache import ScalarCache
+from cattrs_extras.columns import ColumnBuilder
+from cattrs_extras.columns import ColumnParser
+from cattrs_extras.columns import arrow_to_columns
+from cattrs_extras.columns import make_column_builder
+from cattrs_extras.columns import make_column_parser
+from cattrs_extras.instrumentation import HookCallback
+from cattrs_extras.instrumentation import HookKey
+from cattrs_extras.instrumentation import HookStats
+from cattrs_extras.instrumentation import Instrumentation
+from cattrs_extras.lazy import LazyList
+from cattrs_extras.lazy import LazyProxy
+from cattrs_extras.lazy import materialize
+from cattrs_extras.parsers import DateParser
+from cattrs_extras.parsers import DatetimeParser
+from cattrs_extras.parsers import TimedeltaParser
 
 T = TypeVar("T")  # pylint: disable=invalid-name
+C = TypeVar("C", bound="Converter")  # pylint: disable=invalid-name
 NoneType = type(None)
 
+_generated_counter = count()
+
 
 class ReversedEnum(Enum):
     ...
@@ -31,74 +91,1094 @@ class StructureError(ValueError):
 
 
 class PEP563NotImplementedError(StructureError, NotImplementedError):
-    pass
+    """Deprecated, string annotations are resolved now; kept for backward compatibility."""
+
+
+class BatchStructureError(StructureError):
+    """Some items of a batch have failed to structure; `errors` maps item indexes to exceptions."""
+
+    def __init__(self, cl: Any, errors: Dict[int, Exception]) -> None:
+        self._cl = cl
+        self.errors = errors
+        human_class = getattr(cl, "__qualname__", cl)
+        human_errors = "\n".join(f"  [{index}] {exc}" for index, exc in errors.items())
+        super().__init__(f"Cannot structure {len(errors)} items of {human_class}:\n{human_errors}")
+
+    def __reduce__(self) -> Any:
+        return self.__class__, (self._cl, self.errors)
+
+
+class _MappingExpectedError(StructureError):
+    """Input of attrs class is not a mapping; enclosing attrs class reports it as a field type mismatch."""
+
+
+class FieldError:
+    """Single field failure of `ValidationError`; `path` looks like `orders[3].items[0].price`, empty for class itself."""
+
+    __slots__ = ("path", "message")
+
+    def __init__(self, path: str, message: str) -> None:
+        self.path = path
+        self.message = message
+
+    def __repr__(self) -> str:
+        return f"FieldError(path={self.path!r}, message={self.message!r})"
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, FieldError):
+            return NotImplemented
+        return (self.path, self.message) == (other.path, other.message)
+
+
+class ValidationError(StructureError):
+    """Structuring has failed with `collect_errors` enabled; `errors` contains failures of all fields."""
+
+    def __init__(self, cl: Any, errors: List[FieldError]) -> None:
+        self._cl = cl
+        self.errors = errors
+        human_class = getattr(cl, "__qualname__", cl)
+        human_errors = "\n".join(f"  {e.path}: {e.message}" if e.path else f"  {e.message}" for e in errors)
+        super().__init__(f"Cannot structure {human_class}: {len(errors)} invalid fields\n{human_errors}")
+
+    def __reduce__(self) -> Any:
+        return self.__class__, (self._cl, self.errors)
+
+
+def _join_path(prefix: str, path: str) -> str:
+    if not path:
+        return prefix
+    if path[0] == "[":
+        return prefix + path
+    return f"{prefix}.{path}"
+
+
+def _field_error(exc: Exception, cl: Type, value: Any, type_repr: str) -> Exception:
+    """Get an exception to raise on field failure; nested StructureErrors are already human-readable."""
+    if isinstance(exc, StructureError) and not isinstance(exc, _MappingExpectedError):
+        return exc
+    error = StructureError(f"Cannot structure {cl.__qualname__}: {value} is not an instance of {type_repr}")
+    error.__cause__ = exc
+    return error
+
+
+def _field_errors(exc: Exception, path: str, value: Any, type_repr: str) -> List[FieldError]:
+    """Get field errors of a failed field or item prefixed with its path."""
+    if isinstance(exc, ValidationError):
+        return [FieldError(_join_path(path, e.path), e.message) for e in exc.errors]
+    if isinstance(exc, StructureError) and not isinstance(exc, _MappingExpectedError):
+        return [FieldError(path, str(exc))]
+    return [FieldError(path, f"{value} is not an instance of {type_repr}")]
+
+
+def _missing_arguments(missing: List[Tuple[str, bool]]) -> str:
+    """Format missing `__init__` arguments the same way Python does; positional ones are reported first."""
+    positional = [name for name, kw_only in missing if not kw_only]
+    names = positional or [name for name, _ in missing]
+    kind = "positional" if positional else "keyword-only"
+    quoted = [repr(name) for name in names]
+    if len(quoted) == 1:
+        human_names = quoted[0]
+    elif len(quoted) == 2:
+        human_names = f"{quoted[0]} and {quoted[1]}"
+    else:
+        human_names = f"{', '.join(quoted[:-1])}, and {quoted[-1]}"
+    plural = "" if len(names) == 1 else "s"
+    return f"missing {len(names)} required {kind} argument{plural}: {human_names}"
+
+
+def _get_source_key(source: str) -> str:
+    return blake2b(source.encode(), digest_size=16).hexdigest()
+
+
+def _compile_function(fn_name: str, lines: List[str], globs: Dict[str, Any]) -> Callable[..., Any]:
+    """Compile generated function source and register it in linecache to keep tracebacks readable."""
+    script = "\n".join(lines)
+    filename = f"<cattrs_extras generated {fn_name} #{next(_generated_counter)}>"
+    eval(compile(script, filename, "exec"), globs)  # pylint: disable=eval-used
+    linecache.cache[filename] = (len(script), None, [line + "\n" for line in lines], filename)
+    return globs[fn_name]
+
+
+def _make_dis_func(union: Any, cls_and_attrs: List[Tuple[Type, Set[str]]]) -> Callable[[Mapping], Type]:
+    """Create a disambiguation function choosing the union member with the least attributes containing all data keys.
+
+    Every attribute name is mapped to a bitmask of members having it, so a lookup costs one AND per data key.
+    """
+    if len([attrs for _, attrs in cls_and_attrs if len(attrs) == 0]) > 1:
+        raise StructureError(f"Cannot structure {union}: at least two classes have no attributes.")
+
+    cls_and_attrs = sorted(cls_and_attrs, key=lambda c_a: len(c_a[1]))
+    classes = tuple(cls for cls, _ in cls_and_attrs)
+    attr_masks: Dict[str, int] = {}
+    for bit, (_, attrs) in enumerate(cls_and_attrs):
+        for attr_name in attrs:
+            attr_masks[attr_name] = attr_masks.get(attr_name, 0) | 1 << bit
+
+    all_mask = (1 << len(classes)) - 1
+    get_mask = attr_masks.get
+
+    def _dis_func(data: Mapping) -> Type:
+        if not isinstance(data, Mapping):
+            raise StructureError(f"Cannot structure {union}: only mappings are supported as input.")
+        mask = all_mask
+        for data_key in data:
+            mask &= get_mask(data_key, 0)
+            if not mask:
+                break
+        else:
+            # NOTE: Lowest bit stands for the member with the least attributes
+            return classes[(mask & -mask).bit_length() - 1]
+        raise StructureError(f"Cannot structure {union}: {data} does not match any of generic arguments")
+
+    return _dis_func
+
+
+def _make_decimal_quantizer(decimal_places: int, max_digits: Optional[int], context: Context) -> Callable[[Decimal], Decimal]:
+    """Make a function rounding Decimal to `decimal_places`; exponent and context are computed once."""
+    exp = Decimal(1).scaleb(-decimal_places)
+    context = context.copy()
+    if max_digits is not None:
+        context.prec = max_digits
+    quantize = Decimal.quantize
+
+    def _quantize(value: Decimal) -> Decimal:
+        try:
+            return quantize(value, exp, context=context)
+        except InvalidOperation:
+            raise StructureError(
+                f"Cannot structure Decimal: {value} doesn't fit into {max_digits} digits with {decimal_places} decimal places"
+            ) from None
+
+    return _quantize
+
+
+def _unwrap_optional(type_: Any) -> Tuple[Any, bool]:
+    """Get the inner type of Optional and whether it was Optional."""
+    union_types = get_args(type_)
+    if len(union_types) == 2 and NoneType in union_types:
+        return next(e for e in union_types if e is not NoneType), True
+    return type_, False
+
+
+def _has_forward_refs(type_: Any) -> bool:
+    return any(isinstance(arg, (str, ForwardRef)) or _has_forward_refs(arg) for arg in get_args(type_))
+
+
+def _dispatch_instrumented(instrumentation: Instrumentation, kind: str, dispatch: Callable[[Any], Any], cl: Any) -> Any:
+    return instrumentation.wrap(kind, cl, dispatch(cl))
+
+
+class _DispatchTable(dict):
+    """Precomputed hooks by type; missing ones are resolved with fallback dispatch and stored."""
+
+    __slots__ = ("_fallback",)
+
+    def __init__(self, fallback: Callable[[Any], Any]) -> None:
+        super().__init__()
+        self._fallback = fallback
+
+    def __missing__(self, type_: Any) -> Any:
+        handler = self[type_] = self._fallback(type_)
+        return handler
+
+
+class _ConverterSpec(NamedTuple):
+    token: str
+    cls: Type["Converter"]
+    args: Tuple[Any, ...]
+    kwargs: Dict[str, Any]
+    registrations: Tuple[Tuple[str, Tuple[Any, ...]], ...]
+
+
+_worker_converters: "OrderedDict[Tuple[str, int], Converter]" = OrderedDict()
+_WORKER_CONVERTERS_LIMIT = 16
+
+
+def _get_worker_converter(spec: _ConverterSpec) -> "Converter":
+    """Build a converter from spec once per process; the most recently used converters are kept."""
+    key = (spec.token, len(spec.registrations))
+    try:
+        _worker_converters.move_to_end(key)
+        return _worker_converters[key]
+    except KeyError:
+        pass
+
+    converter = spec.cls(*spec.args, **spec.kwargs)
+    for method, args in spec.registrations:
+        getattr(converter, method)(*args)
+
+    _worker_converters[key] = converter
+    if len(_worker_converters) > _WORKER_CONVERTERS_LIMIT:
+        _worker_converters.popitem(last=False)
+    return converter
+
+
+def _structure_chunk_in_worker(spec: _ConverterSpec, objs: List[Any], cl: Type[T]) -> Tuple[List[T], Dict[int, Exception]]:
+    return _get_worker_converter(spec)._structure_chunk(objs, cl)
+
+
+def _check_stream_format(format: str, backend: Backend) -> None:  # pylint: disable=redefined-builtin
+    if format != "jsonl":
+        raise ValueError(f"Unsupported stream format: {format}")
+    if not backend.jsonl:
+        raise ValueError(f"Stream format {format} is not supported by {backend.name} backend")
 
 
 class Converter(cattr.Converter):
     """cattrs converter patched to correctly load complex attrs structures.
 
-    Keep in mind that __future__.annotations import is not supported when using this class!
+    String annotations, including ones produced by `from __future__ import annotations`, are resolved against the
+    module of attrs class once per class.
+
+    With `learn_datetime_formats` enabled every datetime and date field gets its own parser remembering the format of
+    the last parsed value.
+
+    With `collect_errors` enabled structuring doesn't stop on the first invalid field; ValidationError with paths and
+    messages of all failed fields is raised instead.
+
+    `backend` is used by `dumps` and `loads` methods and for streaming; types it serializes natively are not
+    unstructured. Use `for_orjson` and `for_msgpack` shortcuts to get a converter preconfigured for these libraries.
+
+    With `instrument` enabled call counts, failures and cumulative time of every hook are collected per type, see
+    `hook_stats()`. Disabled instrumentation adds no overhead.
+
+    Decimal attrs fields with `decimal_places` and optionally `max_digits` in metadata are quantized on structuring, as
+    well as Tortoise DecimalFields; `decimal_context` sets rounding and traps. With `fixed_scale_decimals` enabled such
+    fields are unstructured to strings with exactly `decimal_places` digits after the point, e.g. `"1.50"`.
+
+    With `scalar_cache_size` set Decimal, datetime, date, timedelta and enum values structured by built-in hooks are
+    cached by type and raw value in a LRU cache of this size; entries expire after `scalar_cache_ttl` seconds, if set.
+    See `scalar_cache_stats()`. Hooks registered by user are never cached.
     """
 
-    def __init__(self):
-        super().__init__()
+    _init_args: Tuple[Tuple[Any, ...], Dict[str, Any]]
+    _spec_token: str
+    _registrations: List[Tuple[str, Tuple[Any, ...]]]
+    _record_registrations: bool
+    _frozen: bool
 
-        self.register_structure_hook(Decimal, self._structure_decimal)
-        self.register_unstructure_hook(Decimal, self._unstructure_decimal)
+    def __new__(cls, *args: Any, **kwargs: Any) -> "Converter":
+        self = super().__new__(cls)
+        self._init_args = (args, kwargs)
+        self._spec_token = uuid4().hex
+        self._registrations = []
+        self._record_registrations = False
+        self._frozen = False
+        return self
+
+    def __init__(
+        self,
+        learn_datetime_formats: bool = False,
+        instrument: bool = False,
+        hook_callback: Optional[HookCallback] = None,
+        collect_errors: bool = False,
+        backend: str = "json",
+        decimal_context: Optional[Context] = None,
+        fixed_scale_decimals: bool = False,
+        scalar_cache_size: int = 0,
+        scalar_cache_ttl: Optional[float] = None,
+    ) -> None:
+        # NOTE: Cleared on every hook registration
+        self._column_plans: Dict[Type, List[Tuple[str, Callable[[Any], Any], ColumnBuilder]]] = {}
+        self._column_parsers: Dict[Type, List[Tuple[str, str, bool, ColumnParser]]] = {}
+        self._lazy_field_hooks: Dict[Attribute, Callable[[Any, Type], Any]] = {}
+        self._attrs_structure_funcs: Dict[Type, Callable[..., Any]] = {}
+        self._column_assemblers: Dict[Tuple[Type, Tuple[str, ...]], Callable[..., List[Any]]] = {}
+        super().__init__()
+        self._backend = get_backend(backend)
+        self._decimal_context = decimal_context or Context()
+        self._fixed_scale_decimals = fixed_scale_decimals
+        self._learn_datetime_formats = learn_datetime_formats
+        self._collect_errors = collect_errors
+        self._attrs_in_progress: Set[Type] = set()
+        self._instrumentation: Optional[Instrumentation] = None
+        self._datetime_parser = DatetimeParser(learn=learn_datetime_formats)
+        self._date_parser = DateParser(learn=learn_datetime_formats)
+        self._timedelta_parser = TimedeltaParser()
+        self._attrs_fields: Dict[Type, Tuple[Attribute, ...]] = {}
+        self._lazy_fields: Dict[Type, Dict[str, Attribute]] = {}
+        self._compiled_code: Dict[str, CodeType] = {}
+        self._generated_sources: Optional[Dict[str, Tuple[str, str]]] = None
+        self._lazy_types: Dict[Any, Tuple[Optional[Type], Any]] = {}
+        self._decimal_quantizers: Dict[Tuple[int, Optional[int]], Callable[[Decimal], Decimal]] = {}
+        self._attrs_decimal_hooks: Dict[Type, Dict[str, Callable[[Any], Any]]] = {}
+        self._scalar_cache = ScalarCache(scalar_cache_size, scalar_cache_ttl) if scalar_cache_size else None
 
+        # NOTE: Built-in hooks of immutable types; columns are converted at once while these hooks are in effect
+        self._scalar_structure_hooks: Dict[Type, Callable[[Any, Type], Any]] = {
+            Decimal: self._cache_scalar(self._structure_decimal),
+            datetime: self._cache_scalar(self._datetime_parser),
+            date: self._cache_scalar(self._date_parser),
+            timedelta: self._cache_scalar(self._timedelta_parser),
+            Enum: self._cache_scalar(self._structure_call),
+            ReversedEnum: self._cache_scalar(self._structure_reversed_enum),
+        }
+        for type_, hook in self._scalar_structure_hooks.items():
+            self.register_structure_hook(type_, hook)
         self.register_structure_hook(NoneType, lambda obj, cls: obj)
 
-        self.register_structure_hook(datetime, self._structure_datetime)
+        self.register_unstructure_hook(Decimal, self._unstructure_decimal)
         self.register_unstructure_hook(datetime, self._unstructure_datetime)
-        self.register_structure_hook(date, self._structure_date)
         self.register_unstructure_hook(date, self._unstructure_date)
-        self.register_structure_hook(timedelta, self._structure_timedelta)
         self.register_unstructure_hook(timedelta, self._unstructure_timedelta)
-        self.register_structure_hook(ReversedEnum, self._structure_reversed_enum)
         self.register_unstructure_hook(ReversedEnum, self._unstructure_reversed_enum)
+        self.register_structure_hook_factory(has, self._gen_structure_attrs)
+        self.register_unstructure_hook(LazyProxy, self._unstructure_lazy)
+        self.register_unstructure_hook(LazyList, self._unstructure_lazy)
+        for type_ in self._backend.passthrough:
+            self.register_unstructure_hook(type_, self._unstructure_identity)
+
+        if instrument or hook_callback:
+            self.enable_instrumentation(hook_callback)
+        self._record_registrations = True
+
+    @classmethod
+    def for_orjson(cls: Type[C], *args: Any, **kwargs: Any) -> C:
+        """Create a converter leaving datetime and date objects to orjson."""
+        return cls(*args, backend="orjson", **kwargs)  # type: ignore
+
+    @classmethod
+    def for_msgpack(cls: Type[C], *args: Any, **kwargs: Any) -> C:
+        """Create a converter leaving datetime, date and Decimal objects to msgpack extension types."""
+        return cls(*args, backend="msgpack", **kwargs)  # type: ignore
+
+    def freeze(self, *roots: Any) -> None:
+        """Precompute hooks of root types and all types reachable from them, then disallow registering hooks.
+
+        Dispatch becomes a single dict lookup; hooks of types not reachable from roots are resolved on the first use and
+        stored as well. Call it once after configuration, e.g. with all attrs classes and Tortoise models of a service.
+        """
+        if self._frozen:
+            raise RuntimeError("Converter is already frozen")
+        types = self._get_reachable_types(roots)
+
+        for dispatcher in (self._structure_func, self._unstructure_func):
+            table = _DispatchTable(dispatcher.dispatch)
+            for type_ in types:
+                # NOTE: Invalid types, e.g. unions of unsupported classes, will fail on use with the same error
+                with suppress(StructureError):
+                    table[type_]  # pylint: disable=pointless-statement
+            dispatcher.dispatch = table.__getitem__
+
+        self._registrations.append(("freeze", roots))
+        self._frozen = True
+
+    def load_compiled(self, module: Union[str, ModuleType]) -> None:
+        """Use functions of a module generated with `python -m cattrs_extras.compile` instead of compiling them.
+
+        A compiled function is used only when its source is exactly the same as the one this converter generates, so
+        outdated modules are safe to load. Sources are still generated and hashed on first dispatch of every type, since
+        functions depend on hooks resolved at runtime; only `compile` calls are skipped. Load modules before structuring
+        or unstructuring anything.
+        """
+        if isinstance(module, str):
+            module = importlib.import_module(module)
+        self._record_registration("load_compiled", module.__name__)
+        self._compiled_code.update({key: fn.__code__ for key, fn in module.FUNCTIONS.items()})
+
+    def dumps(self, obj: Any, unstructure_as: Any = None) -> bytes:
+        """Unstructure and serialize an object with converter backend."""
+        return self._backend.dumps(self.unstructure(obj, unstructure_as=unstructure_as))
+
+    def loads(self, data: Union[str, bytes], cl: Type[T]) -> T:
+        """Deserialize data with converter backend and structure it."""
+        return self.structure(self._backend.loads(data), cl)
+
+    def enable_instrumentation(self, callback: Optional[HookCallback] = None) -> None:
+        """Start collecting hook stats; `callback` is called after every hook call with kind, type, elapsed time and failure flag."""
+        self._set_instrumentation(Instrumentation(callback))
+
+    def disable_instrumentation(self) -> None:
+        """Stop collecting hook stats and restore plain dispatch."""
+        self._set_instrumentation(None)
+
+    @contextmanager
+    def instrumented(self, callback: Optional[HookCallback] = None) -> Iterator[Instrumentation]:
+        """Collect hook stats within a block only, then restore previous instrumentation state."""
+        previous = self._instrumentation
+        instrumentation = Instrumentation(callback)
+        self._set_instrumentation(instrumentation)
+        try:
+            yield instrumentation
+        finally:
+            self._set_instrumentation(previous)
+
+    def hook_stats(self, reset: bool = False) -> Dict[HookKey, HookStats]:
+        """Get a snapshot of hook stats keyed by hook kind (`structure` or `unstructure`) and type."""
+        if self._instrumentation is None:
+            raise RuntimeError("Instrumentation is disabled")
+        stats = self._instrumentation.snapshot()
+        if reset:
+            self._instrumentation.reset()
+        return stats
+
+    def scalar_cache_stats(self, reset: bool = False) -> CacheStats:
+        """Get a snapshot of scalar cache hits, misses, evictions, expirations and size."""
+        if self._scalar_cache is None:
+            raise RuntimeError("Scalar cache is disabled")
+        stats = self._scalar_cache.snapshot()
+        if reset:
+            self._scalar_cache.reset()
+        return stats
+
+    def clear_scalar_cache(self) -> None:
+        """Drop all cached scalar values, e.g. after changing a datetime parser; stats are kept."""
+        if self._scalar_cache is not None:
+            self._scalar_cache.clear()
+
+    def structure_many(
+        self,
+        objs: Iterable[Any],
+        cl: Type[T],
+        executor: Optional[Executor] = None,
+        chunk_size: int = 1000,
+    ) -> List[T]:
+        """Structure a batch of objects of the same type resolving the hook only once.
+
+        Structuring doesn't stop on the first failure; BatchStructureError with errors of all failed items is raised instead.
+
+        If `executor` is set, input is split into chunks of `chunk_size` items structured in parallel; results keep input
+        order. Process pool workers build their own converter from constructor arguments and hooks registered after it,
+        once per worker, so these hooks must be picklable.
+        """
+        if executor is None:
+            result, errors = self._structure_chunk(objs, cl)
+        else:
+            result, errors = [], {}
+            spec = self._get_spec() if isinstance(executor, ProcessPoolExecutor) else None
+
+            iterator = iter(objs)
+            futures: List[Future] = []
+            while chunk := list(islice(iterator, chunk_size)):
+                if spec is None:
+                    futures.append(executor.submit(self._structure_chunk, chunk, cl))
+                else:
+                    futures.append(executor.submit(_structure_chunk_in_worker, spec, chunk, cl))
+
+            for chunk_index, future in enumerate(futures):
+                chunk_result, chunk_errors = future.result()
+                result.extend(chunk_result)
+                offset = chunk_index * chunk_size
+                errors.update({offset + index: exc for index, exc in chunk_errors.items()})
+
+        if errors:
+            raise BatchStructureError(cl, errors)
+        return result
+
+    def unstructure_many(self, objs: Iterable[Any], unstructure_as: Any = None) -> List[Any]:
+        """Unstructure a batch of objects resolving the hook only when item class changes."""
+        dispatch = self._unstructure_func.dispatch
+        if unstructure_as is not None:
+            handler = dispatch(unstructure_as)
+            return [handler(obj) for obj in objs]
+
+        result: List[Any] = []
+        append = result.append
+        last_cls, handler = None, None
+        for obj in objs:
+            if obj.__class__ is not last_cls:
+                last_cls = obj.__class__
+                handler = dispatch(last_cls)
+            append(handler(obj))  # type: ignore
+        return result
+
+    def unstructure_columns(self, objs: Iterable[Any], cl: Type) -> Dict[str, Any]:
+        """Unstructure attrs class instances to numpy arrays by field name, converting each column at once.
+
+        Column types are chosen by field types, see `cattrs_extras.columns.make_column_builder`; requires numpy.
+        """
+        if not isinstance(objs, list):
+            objs = list(objs)
+        return {name: build(list(map(getter, objs))) for name, getter, build in self._get_column_plan(cl)}
+
+    def structure_columns(self, columns: Any, cl: Type[T]) -> List[T]:
+        """Structure attrs class instances from columns by field name without building a dict per row.
+
+        `columns` is a mapping of field names to numpy arrays, `Categorical` columns or lists, or an Arrow record batch or
+        table, which is converted to numpy arrays with `cattrs_extras.columns.arrow_to_columns`.
+        Built-in hooks are applied to whole columns where possible, see `cattrs_extras.columns.make_column_parser`.
+        Structuring stops on the first invalid column.
+        """
+        if not isinstance(columns, Mapping) and hasattr(columns, "to_pydict"):
+            columns = arrow_to_columns(columns)
+
+        qualname = cl.__qualname__
+        names, values = [], []
+        for name, init_name, required, parse in self._get_column_parsers(cl):
+            if name not in columns:
+                if required:
+                    raise StructureError(f"Cannot structure {qualname}: missing required column {name!r}")
+                continue
+            try:
+                values.append(parse(columns[name]))
+            except StructureError:
+                raise
+            except Exception as exc:
+                raise StructureError(f"Cannot structure {qualname}: invalid {name!r} column: {exc}") from exc
+            names.append(init_name)
+
+        if not values:
+            return []
+        if len({len(column) for column in values}) > 1:
+            raise StructureError(f"Cannot structure {qualname}: columns have different lengths")
+        try:
+            return self._get_column_assembler(cl, tuple(names))(*values)
+        except Exception as exc:
+            raise StructureError(f"Cannot structure {qualname}: {exc}") from exc
+
+    def iter_structure(self, fp: IO, cl: Type[T], format: str = "jsonl") -> Iterator[T]:  # pylint: disable=redefined-builtin
+        """Lazily parse and structure records from a text or binary file-like object one at a time.
+
+        Only JSON Lines format is supported currently; empty lines are skipped.
+        """
+        _check_stream_format(format, self._backend)
+        handler = self._structure_func.dispatch(cl)
+        loads = self._backend.loads
+
+        for lineno, line in enumerate(fp, 1):
+            if not line.strip():
+                continue
+            try:
+                yield handler(loads(line), cl)
+            except Exception as exc:
+                raise StructureError(f"Cannot structure line {lineno}: {exc}") from exc
+
+    def iter_unstructure_to(self, fp: IO, objs: Iterable[Any], format: str = "jsonl") -> int:  # pylint: disable=redefined-builtin
+        """Unstructure and write objects to a text or binary file-like object one at a time.
+
+        Returns the number of written records.
+        """
+        write = self._get_stream_writer(fp, format)
+        dispatch = self._unstructure_func.dispatch
+        written = 0
+
+        for obj in objs:
+            write(dispatch(obj.__class__)(obj))
+            written += 1
+
+        return written
+
+    def _get_stream_writer(self, fp: IO, format: str) -> Callable[[Any], None]:  # pylint: disable=redefined-builtin
+        _check_stream_format(format, self._backend)
+        dumps = self._backend.dumps
+        write = fp.write
+
+        if isinstance(fp, (io.RawIOBase, io.BufferedIOBase)):
+            return lambda data: write(dumps(data) + b"\n")  # type: ignore
+        return lambda data: write((dumps(data) + b"\n").decode())  # type: ignore
+
+    def structure_lazy(self, obj: Mapping, cl: Type[T]) -> T:
+        """Get a lazy proxy of an attrs class structuring fields and list items on first access.
+
+        Latency depends on the number of fields actually read rather than on the document size. Errors are raised on
+        access; see `cattrs_extras.lazy` module.
+        """
+        if not has(cl):
+            raise StructureError(f"Cannot structure {cl}: only attrs classes can be structured lazily")
+        return self._structure_lazy_value(obj, cl)
+
+    def register_structure_hook(self, cl: Any, func: Callable[[Any, Type[T]], T]) -> None:
+        self._record_registration("register_structure_hook", cl, func)
+        super().register_structure_hook(cl, func)
+
+    def register_structure_hook_func(self, check_func: Callable[[Any], bool], func: Callable[[Any, Type[T]], T]) -> None:
+        self._record_registration("register_structure_hook_func", check_func, func)
+        super().register_structure_hook_func(check_func, func)
+
+    def register_structure_hook_factory(self, predicate: Callable[[Any], bool], factory: Callable[[Any], Callable[..., Any]]) -> None:
+        self._record_registration("register_structure_hook_factory", predicate, factory)
+        super().register_structure_hook_factory(predicate, factory)
+
+    def register_unstructure_hook(self, cls: Any, func: Callable[[Any], Any]) -> None:
+        self._record_registration("register_unstructure_hook", cls, func)
+        super().register_unstructure_hook(cls, func)
+
+    def register_unstructure_hook_func(self, check_func: Callable[[Any], bool], func: Callable[[Any], Any]) -> None:
+        self._record_registration("register_unstructure_hook_func", check_func, func)
+        super().register_unstructure_hook_func(check_func, func)
+
+    def register_unstructure_hook_factory(self, predicate: Callable[[Any], bool], factory: Callable[[Any], Callable[..., Any]]) -> None:
+        self._record_registration("register_unstructure_hook_factory", predicate, factory)
+        super().register_unstructure_hook_factory(predicate, factory)
 
     def structure_attrs_fromdict(self, obj: Mapping, cl: Type[T]) -> T:
         """Instantiate an attrs class from a mapping.
 
-        Raises human-readable StructureError exceptions on failure.
+        Raises human-readable StructureError exceptions on failure. Registered hooks of the class itself are bypassed, so
+        they can delegate to this method.
         """
         try:
-            # self._eval_str_types(cl)
-            return super().structure_attrs_fromdict(obj or {}, cl)
-        # NOTE: If exception has occurred while structuring nested attrs class raise it directly without further processing
-        except StructureError:
-            raise
-        except Exception as exc:
-            last_frame_locals = sys.exc_info()[2].tb_next.tb_frame.f_locals  # type: ignore
-            human_class = last_frame_locals["cl"].__qualname__
+            structure = self._attrs_structure_funcs[cl]
+        except KeyError:
+            structure = self._attrs_structure_funcs[cl] = self._gen_structure_attrs(cl)
+        return structure(obj, cl)
+
+    def unstructure_attrs_asdict(self, obj: Any) -> Dict[str, Any]:
+        """Unstructure an attrs class instance into a dict using resolved field types."""
+        dispatch = self._unstructure_func.dispatch
+        res = self._dict_factory()
+        decimal_hooks = self._get_attrs_decimal_hooks(obj.__class__) if self._fixed_scale_decimals else None
+        for a in self._get_attrs_fields(obj.__class__):
+            name = a.name
+            v = getattr(obj, name)
+            if decimal_hooks and name in decimal_hooks:
+                res[name] = decimal_hooks[name](v)
+            else:
+                res[name] = dispatch(a.type or v.__class__)(v)
+        return res
+
+    def _structure_list(self, obj: Iterable[Any], cl: Any) -> List[Any]:
+        """Convert an iterable to a potentially generic list; collect errors with item indexes in paths, if enabled."""
+        elem_types = get_args(cl)
+        if not self._collect_errors or not elem_types or elem_types[0] is Any:
+            return super()._structure_list(obj, cl)
+
+        elem_type = elem_types[0]
+        handler = self._structure_func.dispatch(elem_type)
+        res = []
+        errors: List[FieldError] = []
+        for index, e in enumerate(obj):
+            try:
+                res.append(handler(e, elem_type))
+            except Exception as exc:  # pylint: disable=broad-except
+                errors.extend(_field_errors(exc, f"[{index}]", e, str(elem_type)))
+        if errors:
+            raise ValidationError(cl, errors)
+        return res
+
+    def _gen_structure_attrs(self, cl: Any) -> Callable[..., Any]:
+        """Generate a structuring function for an attrs class.
+
+        Field handlers are resolved once, result is cached by cattrs dispatch until the next hook registration. Errors
+        are reported by generated code itself: the first one as StructureError or all of them as ValidationError.
+        """
+        fn_name = f"structure_{cl.__name__}"
+        qualname = cl.__qualname__
+        globs: Dict[str, Any] = {
+            "cl": cl,
+            "Mapping": Mapping,
+            "StructureError": StructureError,
+            "ValidationError": ValidationError,
+            "FieldError": FieldError,
+            "MappingExpectedError": _MappingExpectedError,
+            "field_error": _field_error,
+            "field_errors": _field_errors,
+            "missing_arguments": _missing_arguments,
+        }
+        lines = [
+            f"def {fn_name}(obj, _):",
+            "    if obj.__class__ is not dict and not isinstance(obj, Mapping):",
+            "        if obj:",
+            f"            raise MappingExpectedError(f'Cannot structure {qualname}: {{obj}} is not a mapping')",
+            "        obj = {}",
+            "    res = {}",
+            "    errors = []" if self._collect_errors else "    missing = []",
+        ]
+
+        self._attrs_in_progress.add(cl)
+        try:
+            for i, a in enumerate(self._get_attrs_fields(cl)):
+                if not a.init:
+                    continue
+                name, init_name = a.name, a.name.lstrip("_")
+                lines.append(f"    if {name!r} in obj:")
+                if a.type is None:
+                    lines.append(f"        res[{init_name!r}] = obj[{name!r}]")
+                else:
+                    globs[f"h_{i}"] = self._get_attrs_field_hook(a)
+                    globs[f"t_{i}"] = a.type
+                    globs[f"r_{i}"] = str(a.type)
+                    lines.extend(
+                        [
+                            f"        v = obj[{name!r}]",
+                            "        try:",
+                            f"            res[{init_name!r}] = h_{i}(v, t_{i})",
+                            "        except Exception as exc:",
+                            f"            errors.extend(field_errors(exc, {name!r}, v, r_{i}))"
+                            if self._collect_errors
+                            else f"            raise field_error(exc, cl, v, r_{i})",
+                        ]
+                    )
+                if a.default is NOTHING:
+                    lines.append("    else:")
+                    if self._collect_errors:
+                        lines.append(f"        errors.append(FieldError({name!r}, 'missing required field'))")
+                    else:
+                        lines.append(f"        missing.append(({init_name!r}, {bool(a.kw_only)!r}))")
+        finally:
+            self._attrs_in_progress.discard(cl)
+
+        if self._collect_errors:
+            lines.extend(
+                [
+                    "    if errors:",
+                    "        raise ValidationError(cl, errors)",
+                    "    try:",
+                    "        return cl(**res)",
+                    "    except Exception as exc:",
+                    "        raise ValidationError(cl, [FieldError('', str(exc))]) from exc",
+                ]
+            )
+        else:
+            lines.extend(
+                [
+                    "    if missing:",
+                    f"        raise StructureError(f'Cannot structure {qualname}: {{missing_arguments(missing)}}')",
+                    "    try:",
+                    "        return cl(**res)",
+                    "    except Exception as exc:",
+                    f"        raise StructureError(f'Cannot structure {qualname}: {{exc}}') from exc",
+                ]
+            )
+
+        return self._build_function(fn_name, lines, globs)
 
-            if isinstance(exc, TypeError) and "required keyword-only" in str(exc):
-                exc_message = " ".join(str(exc).split()[1:])
-                message = f"Cannot structure {human_class}: {exc_message}"
+    def _build_function(self, fn_name: str, lines: List[str], globs: Dict[str, Any]) -> Callable[..., Any]:
+        """Compile generated function or reuse code of a function with exactly the same source from a compiled module."""
+        source = "\n".join(lines)
+        key = _get_source_key(source)
+        if self._generated_sources is not None:
+            self._generated_sources[key] = (fn_name, source)
+
+        code = self._compiled_code.get(key)
+        if code is None:
+            return _compile_function(fn_name, lines, globs)
+        return FunctionType(code, globs, fn_name)
+
+    def _get_attrs_field_hook(self, a: Attribute) -> Callable[[Any, Type], Any]:
+        """Get structure hook for attrs class field; classes being generated are dispatched on call to allow recursion."""
+        if a.type in self._attrs_in_progress:
+            return self.structure
+        quantize = self._get_attrs_decimal_quantizer(a)
+        if quantize is not None:
+            return self._get_decimal_structure_hook(a.type, quantize)
+        return self._get_field_structure_hook(a.type)
+
+    def _get_column_plan(self, cl: Type) -> List[Tuple[str, Callable[[Any], Any], ColumnBuilder]]:
+        """Get names, value getters and column builders of class fields, computed once per class."""
+        try:
+            return self._column_plans[cl]
+        except KeyError:
+            pass
+        plan: List[Tuple[str, Callable[[Any], Any], ColumnBuilder]] = []
+        decimal_hooks = self._get_column_decimal_hooks(cl) if self._fixed_scale_decimals else {}
+        for name, type_ in self._get_column_fields(cl):
+            if type_ is None or type_ is Any:
+                builder = make_column_builder(Any, False, self.unstructure)
             else:
-                value = last_frame_locals["val"]
-                try:
-                    human_type = last_frame_locals["a"]["type"].__name__
-                except (KeyError, TypeError, AttributeError):
-                    human_type = str(last_frame_locals["a"].type)
-                message = f"Cannot structure {human_class}: {value} is not an instance of {human_type}"
+                inner_type, optional = _unwrap_optional(type_)
+                handler = decimal_hooks.get(name) or self._unstructure_func.dispatch(inner_type)
+                builder = make_column_builder(inner_type, optional, None if handler == self._unstructure_identity else handler)
+            plan.append((name, attrgetter(name), builder))
+        self._column_plans[cl] = plan
+        return plan
+
+    def _get_column_fields(self, cl: Type) -> List[Tuple[str, Any]]:
+        """Get names and types of fields to unstructure to columns."""
+        if not has(cl):
+            raise ValueError(f"Cannot unstructure {cl} to columns: not an attrs class")
+        return [(a.name, a.type) for a in self._get_attrs_fields(cl)]
+
+    def _get_column_decimal_hooks(self, cl: Type) -> Dict[str, Callable[[Any], Any]]:
+        """Get fixed-scale unstructure hooks of quantized Decimal fields to unstructure to columns by name."""
+        return self._get_attrs_decimal_hooks(cl) if has(cl) else {}
+
+    def _get_column_parsers(self, cl: Type) -> List[Tuple[str, str, bool, ColumnParser]]:
+        """Get names, init argument names, required flags and column parsers of class fields, computed once per class."""
+        try:
+            return self._column_parsers[cl]
+        except KeyError:
+            pass
+        parsers: List[Tuple[str, str, bool, ColumnParser]] = []
+        for name, init_name, type_, hook, required in self._get_column_structure_fields(cl):
+            inner_type, optional = _unwrap_optional(type_)
+            vectorize = hook is not None and hook == self._structure_func.dispatch(type_) and self._is_scalar_structure_hook(inner_type)
+            parsers.append((name, init_name, required, make_column_parser(inner_type, optional, hook, type_, vectorize)))
+        self._column_parsers[cl] = parsers
+        return parsers
+
+    def _get_column_structure_fields(self, cl: Type) -> List[Tuple[str, str, Any, Optional[Callable[[Any, Type], Any]], bool]]:
+        """Get names, init argument names, types, structure hooks and required flags of fields to structure from columns."""
+        if not has(cl):
+            raise StructureError(f"Cannot structure {cl} from columns: not an attrs class")
+        return [
+            (a.name, a.name.lstrip("_"), a.type, None if a.type is None else self._get_attrs_field_hook(a), a.default is NOTHING)
+            for a in self._get_attrs_fields(cl)
+            if a.init
+        ]
+
+    def _is_scalar_structure_hook(self, type_: Any) -> bool:
+        """Check whether a built-in hook of an immutable type is in effect for a type."""
+        if not isinstance(type_, type):
+            return False
+        handler = self._structure_func.dispatch(type_)
+        return any(handler == self._scalar_structure_hooks.get(base) for base in type_.__mro__)
+
+    def _get_column_assembler(self, cl: Type, names: Tuple[str, ...]) -> Callable[..., List[Any]]:
+        """Get a function creating instances from lists of init argument values, generated once per class and names."""
+        try:
+            return self._column_assemblers[cl, names]
+        except KeyError:
+            pass
+        fn_name = f"structure_columns_{cl.__name__}"
+        arguments = ", ".join(f"{name}=v_{i}" for i, name in enumerate(names))
+        items = ", ".join(f"v_{i}" for i in range(len(names)))
+        columns = ", ".join(f"c_{i}" for i in range(len(names)))
+        lines = [
+            f"def {fn_name}({columns}):",
+            f"    return [cl({arguments}) for {items}, in zip({columns})]",
+        ]
+        assembler = self._column_assemblers[cl, names] = self._build_function(fn_name, lines, {"cl": cl})
+        return assembler
+
+    def _cache_scalar(self, handler: Callable[[Any, Type], Any]) -> Callable[[Any, Type], Any]:
+        """Wrap structure hook returning immutable values with the scalar cache, if enabled."""
+        if self._scalar_cache is None:
+            return handler
+        return self._scalar_cache.wrap(handler)
+
+    def _get_attrs_decimal_quantizer(self, a: Attribute) -> Optional[Callable[[Decimal], Decimal]]:
+        """Get quantizer for a Decimal field with `decimal_places` and optionally `max_digits` in metadata."""
+        decimal_places = a.metadata.get("decimal_places")
+        if decimal_places is None or _unwrap_optional(a.type)[0] is not Decimal:
+            return None
+        return self._get_decimal_quantizer(decimal_places, a.metadata.get("max_digits"))
 
-            raise StructureError(message) from exc
+    def _get_attrs_decimal_hooks(self, cl: Type) -> Dict[str, Callable[[Any], Any]]:
+        """Get fixed-scale unstructure hooks of quantized Decimal fields by name, computed once per class."""
+        try:
+            return self._attrs_decimal_hooks[cl]
+        except KeyError:
+            pass
+        hooks = {}
+        for a in self._get_attrs_fields(cl):
+            quantize = self._get_attrs_decimal_quantizer(a)
+            if quantize is not None:
+                hooks[a.name] = self._get_decimal_unstructure_hook(quantize)
+        self._attrs_decimal_hooks[cl] = hooks
+        return hooks
+
+    def _get_decimal_quantizer(self, decimal_places: int, max_digits: Optional[int] = None) -> Callable[[Decimal], Decimal]:
+        key = (decimal_places, max_digits)
+        try:
+            return self._decimal_quantizers[key]
+        except KeyError:
+            quantize = self._decimal_quantizers[key] = _make_decimal_quantizer(decimal_places, max_digits, self._decimal_context)
+            return quantize
+
+    def _get_decimal_structure_hook(self, type_: Any, quantize: Callable[[Decimal], Decimal]) -> Callable[[Any, Type], Any]:
+        """Get structure hook quantizing values of Decimal or Optional[Decimal] field."""
+        decimal_type, optional = _unwrap_optional(type_)
+        structure = self._structure_func.dispatch(decimal_type)
+
+        def _structure_quantized(obj: Any, _: Any) -> Optional[Decimal]:
+            if obj is None and optional:
+                return None
+            return quantize(structure(obj, decimal_type))
+
+        return _structure_quantized
+
+    def _get_decimal_unstructure_hook(self, quantize: Callable[[Decimal], Decimal]) -> Callable[[Any], Any]:
+        """Get unstructure hook emitting fixed-scale strings, or quantized Decimals if backend serializes them natively."""
+        unstructure = self.unstructure
+
+        if Decimal in self._backend.passthrough:
+
+            def _unstructure_quantized(obj: Any) -> Any:
+                return quantize(obj) if obj.__class__ is Decimal else unstructure(obj)
+
+        else:
+
+            def _unstructure_quantized(obj: Any) -> Any:
+                # NOTE: `str` switches to exponent notation for small values, e.g. 1.0E-7
+                return format(quantize(obj), "f") if obj.__class__ is Decimal else unstructure(obj)
+
+        return _unstructure_quantized
+
+    def _structure_lazy_field(self, proxy: LazyProxy, name: str) -> Any:
+        cl = proxy._lazy_cl
+        try:
+            fields_map = self._lazy_fields[cl]
+        except KeyError:
+            fields_map = self._lazy_fields[cl] = {a.name: a for a in self._get_attrs_fields(cl)}
+        a = fields_map.get(name)
+        if a is None:
+            raise AttributeError(f"{cl.__qualname__!r} object has no attribute {name!r}")
+
+        try:
+            value = proxy._lazy_data[name]
+        except KeyError:
+            if a.default is NOTHING:
+                raise StructureError(f"Cannot structure {cl.__qualname__}: missing required field {name!r}") from None
+            if isinstance(a.default, Factory):  # type: ignore
+                return a.default.factory(proxy) if a.default.takes_self else a.default.factory()  # type: ignore
+            return a.default
+
+        if a.type is None:
+            return value
+        try:
+            try:
+                hook = self._lazy_field_hooks[a]
+            except KeyError:
+                hook = self._lazy_field_hooks[a] = self._get_lazy_field_hook(a)
+            return hook(value, a.type)
+        except Exception as exc:
+            raise _field_error(exc, cl, value, str(a.type))  # pylint: disable=raise-missing-from
+
+    def _get_lazy_field_hook(self, a: Attribute) -> Callable[[Any, Type], Any]:
+        """Get structure hook for a lazy proxy field; attrs classes and lists of them are structured lazily, other types eagerly."""
+        if self._get_lazy_type(a.type)[0] is not None:
+            return self._structure_lazy_value
+        return self._get_attrs_field_hook(a)
+
+    def _structure_lazy_value(self, value: Any, type_: Any) -> Any:
+        try:
+            lazy_cls, inner_type = self._lazy_types[type_]
+        except KeyError:
+            lazy_cls, inner_type = self._lazy_types[type_] = self._get_lazy_type(type_)
+
+        if lazy_cls is None:
+            return self._structure_func.dispatch(type_)(value, type_)
+        # NOTE: None is passed through for Optional and List types only
+        if value is None and inner_type is not type_:
+            return None
+        if lazy_cls is LazyProxy and not isinstance(value, Mapping):
+            raise _MappingExpectedError(f"Cannot structure {inner_type.__qualname__}: {value} is not a mapping")
+        return lazy_cls(self, value, inner_type)
 
     @classmethod
-    def _eval_str_types(cls, attrs_class: Type[T]) -> None:
-        """Evaluate Attribute.type from string annotations.
+    def _get_lazy_type(cls, type_: Any) -> Tuple[Optional[Type], Any]:
+        """Get lazy proxy class and attrs class or list item type for a type, if it can be structured lazily."""
+        union_types = get_args(type_)
+        if len(union_types) == 2 and NoneType in union_types:
+            return cls._get_lazy_type(next(e for e in union_types if e is not NoneType))
+
+        if isinstance(type_, type) and has(type_):
+            return LazyProxy, type_
+        if get_origin(type_) in (list, collections.abc.Sequence) and union_types and cls._get_lazy_type(union_types[0])[0]:
+            return LazyList, union_types[0]
+        return None, None
+
+    def _unstructure_lazy(self, obj: Any) -> Any:
+        return self.unstructure(materialize(obj))
+
+    def _get_attrs_fields(self, cl: Type) -> Tuple[Attribute, ...]:
+        """Get attrs class fields with string annotations resolved.
+
+        Annotations are evaluated with `typing.get_type_hints` against the module of class once; original attributes are
+        left untouched, resolved copies are cached.
+        """
+        try:
+            return self._attrs_fields[cl]
+        except KeyError:
+            pass
+
+        attrs = fields(cl)
+        if any(isinstance(a.type, (str, ForwardRef)) or _has_forward_refs(a.type) for a in attrs):
+            try:
+                hints = get_type_hints(cl)
+            except NameError as exc:
+                raise StructureError(f"Cannot structure {cl.__qualname__}: failed to resolve type annotations: {exc}") from exc
+            attrs = tuple(a.evolve(type=hints[a.name]) if a.name in hints else a for a in attrs)
+
+        self._attrs_fields[cl] = attrs
+        return attrs
+
+    def _structure_chunk(self, objs: Iterable[Any], cl: Type[T]) -> Tuple[List[T], Dict[int, Exception]]:
+        handler = self._structure_func.dispatch(cl)
+        result: List[T] = []
+        append = result.append
+        errors: Dict[int, Exception] = {}
+
+        for index, obj in enumerate(objs):
+            try:
+                append(handler(obj, cl))
+            except Exception as exc:  # pylint: disable=broad-except
+                errors[index] = exc
+
+        return result, errors
+
+    def _get_reachable_types(self, roots: Iterable[Any]) -> List[Any]:
+        types: List[Any] = []
+        seen: Set[Any] = set()
+        stack = list(roots)
+        while stack:
+            type_ = stack.pop()
+            if type_ in seen:
+                continue
+            seen.add(type_)
+            types.append(type_)
+            stack.extend(self._get_type_dependencies(type_))
+        return types
+
+    def _get_type_dependencies(self, type_: Any) -> List[Any]:
+        """Get types a hook of this type may dispatch to: generic arguments and attrs class fields."""
+        if get_origin(type_) is Literal:
+            return []
+        dependencies = [arg for arg in get_args(type_) if arg is not Ellipsis]
+        if isinstance(type_, type) and has(type_):
+            dependencies.extend(a.type for a in self._get_attrs_fields(type_) if a.type is not None)
+        return dependencies
+
+    def _record_registration(self, method: str, *args: Any) -> None:
+        if self._frozen:
+            raise RuntimeError("Converter is frozen, hooks can't be registered anymore")
+        self._column_plans.clear()
+        self._column_parsers.clear()
+        self._lazy_field_hooks.clear()
+        self._attrs_structure_funcs.clear()
+        # NOTE: Hooks registered by constructors, including the ones of subclasses, are recreated by them in workers
+        if self._record_registrations and getattr(args[-1], "__self__", None) is not self:
+            self._registrations.append((method, args))
+
+    def _get_spec(self) -> "_ConverterSpec":
+        """Get a picklable recipe to build the same converter in another process."""
+        args, kwargs = self._init_args
+        return _ConverterSpec(self._spec_token, self.__class__, args, kwargs, tuple(self._registrations))
+
+    def _set_instrumentation(self, instrumentation: Optional[Instrumentation]) -> None:
+        if self._frozen:
+            raise RuntimeError("Converter is frozen, instrumentation can't be changed anymore")
+        self._column_plans.clear()
+        self._column_parsers.clear()
+        self._lazy_field_hooks.clear()
+        self._attrs_structure_funcs.clear()
+        self._instrumentation = instrumentation
+        for kind, dispatcher in (("structure", self._structure_func), ("unstructure", self._unstructure_func)):
+            if instrumentation is None:
+                dispatcher.dispatch = lru_cache(maxsize=None)(dispatcher._dispatch)
+            else:
+                # NOTE: Handlers are wrapped once per type; cattrs clears this cache on every hook registration
+                dispatcher.dispatch = lru_cache(maxsize=None)(partial(_dispatch_instrumented, instrumentation, kind, dispatcher._dispatch))
+
+    def _get_field_structure_hook(self, type_: Any) -> Callable[[Any, Type], Any]:
+        """Get structure hook for a single model or dataclass field."""
+        return self._get_field_parser(type_) or self._structure_func.dispatch(type_)
+
+    def _get_field_parser(self, type_: Any) -> Optional[Callable[[Any, Type], Any]]:
+        """Get a separate datetime parser for a field to learn its format, if enabled; None is passed through for Optional.
 
-        When using attr.dataclass(kw_only=True) decorator attrs set type of generated Optional attribs to their string
-        representations making impossible for cattrs to correctly structure them. This class fixes this issue evaluating
-        strings back into Type objects before structuring.
+        The copy is wrapped with the scalar cache and instrumentation the same way as the hook it's copied from.
         """
-        for attrib in attrs_class.__attrs_attrs__:  # type: ignore
-            if isinstance(attrib.type, str):
-                try:
-                    object.__setattr__(attrib, "type", eval(attrib.type))  # pylint: disable=eval-used
-                except NameError as exc:
-                    raise PEP563NotImplementedError("`Postponed Evaluation of Annotations is not supported") from exc
+        if not self._learn_datetime_formats:
+            return None
+
+        inner_type, optional = _unwrap_optional(type_)
+        handler = inspect.unwrap(self._structure_func.dispatch(inner_type))
+        if not isinstance(handler, DatetimeParser):
+            return None
+
+        parser = self._cache_scalar(handler.copy())
+        if self._instrumentation is not None:
+            parser = self._instrumentation.wrap("structure", inner_type, parser)
+        if not optional:
+            return parser
+
+        def _structure_optional(obj: Any, cl: Type) -> Any:  # pylint: disable=unused-argument
+            return None if obj is None else parser(obj, inner_type)
+
+        _structure_optional.__wrapped__ = parser  # type: ignore
+        return _structure_optional
 
     @staticmethod
     def _get_dis_func(union: Type) -> Callable[..., Type]:
@@ -120,63 +1200,30 @@ class Converter(cattr.Converter):
             raise StructureError(f"Cannot structure {union}: at least two classes required.")
 
         cls_and_attrs = [(cl, {at.name for at in fields(cl)}) for cl in union_types]
-
-        if len([attrs for _, attrs in cls_and_attrs if len(attrs) == 0]) > 1:
-            raise StructureError(f"Cannot structure {union}: at least two classes have no attributes.")
-
-        cls_and_attrs.sort(key=lambda c_a: len(c_a[1]))
-
-        def _dis_func(data: Mapping) -> Type:
-            if not isinstance(data, Mapping):
-                raise StructureError(f"Cannot structure {union}: only mappings are supported as input.")
-            for cls, cls_keys in cls_and_attrs:
-                if all([data_key in cls_keys for data_key in data]):
-                    return cls
-            raise StructureError(f"Cannot structure {union}: {data} does not match any of generic arguments")
-
-        return _dis_func
+        return _make_dis_func(union, cls_and_attrs)
 
     @staticmethod
     def _structure_decimal(obj: Any, cls: Type) -> Decimal:
+        obj_type = obj.__class__
+        if obj_type is cls:
+            return obj
+        # NOTE: Floats are converted via str to get the shortest representation instead of the exact binary value
+        if obj_type is str or obj_type is int:
+            return cls(obj)
         return cls(str(obj))
 
     @staticmethod
     def _unstructure_decimal(obj: Decimal) -> str:
         return str(obj)
 
-    @staticmethod
-    def _structure_datetime(obj: Any, cls: Type) -> datetime:  # pylint: disable=unused-argument
-        with suppress(ValueError, TypeError):
-            return datetime.utcfromtimestamp(float(obj)).replace(tzinfo=timezone.utc)
-        with suppress(dateutil.parser.ParserError):
-            return dateutil.parser.parse(obj)
-        raise ValueError
-
     @staticmethod
     def _unstructure_datetime(obj: datetime) -> float:
         return obj.timestamp()
 
-    @staticmethod
-    def _structure_date(obj: Any, cls: Type) -> date:  # pylint: disable=unused-argument
-        with suppress(ValueError, TypeError):
-            return date.fromtimestamp(float(obj))
-        with suppress(dateutil.parser.ParserError):
-            dt = dateutil.parser.parse(obj)  # pylint: disable=invalid-name
-            return date(year=dt.year, month=dt.month, day=dt.day)
-        raise ValueError
-
     @staticmethod
     def _unstructure_date(obj: date) -> float:
         return datetime(obj.year, obj.month, obj.day, tzinfo=timezone.utc).timestamp()
 
-    @staticmethod
-    def _structure_timedelta(obj: Any, cls: Type) -> timedelta:  # pylint: disable=unused-argument
-        with suppress(ValueError, TypeError):
-            return timedelta(seconds=int(obj))
-        with suppress(TypeError):
-            return timedelta(seconds=timeparse(obj))
-        raise ValueError
-
     @staticmethod
     def _unstructure_timedelta(obj: timedelta) -> float:
         return obj.total_seconds()
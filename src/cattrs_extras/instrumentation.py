@@ -0,0 +1,85 @@
+import time
+from functools import wraps
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Optional
+from typing import Tuple
+
+HookKey = Tuple[str, Any]
+HookCallback = Callable[[str, Any, float, bool], None]
+
+
+class HookStats:
+    """Call counters and cumulative time of a single structure or unstructure hook for a single type.
+
+    Time is measured in seconds and includes nested hook calls, e.g. time of structuring attrs class fields.
+    """
+
+    __slots__ = ("hook", "calls", "failures", "total_time")
+
+    def __init__(self, hook: str, calls: int = 0, failures: int = 0, total_time: float = 0.0) -> None:
+        self.hook = hook
+        self.calls = calls
+        self.failures = failures
+        self.total_time = total_time
+
+    def __repr__(self) -> str:
+        return f"HookStats(hook={self.hook!r}, calls={self.calls}, failures={self.failures}, total_time={self.total_time:.6f})"
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, HookStats):
+            return NotImplemented
+        return (self.hook, self.calls, self.failures, self.total_time) == (other.hook, other.calls, other.failures, other.total_time)
+
+    def copy(self) -> "HookStats":
+        return HookStats(self.hook, self.calls, self.failures, self.total_time)
+
+
+class Instrumentation:
+    """Wraps hooks returned by converter dispatch to collect `HookStats` per hook kind and type.
+
+    Optional `callback` is called after every hook call with kind (`structure` or `unstructure`), type, elapsed time and
+    a flag whether the hook has failed. Counters are not synchronized; use a separate converter per thread.
+    """
+
+    def __init__(self, callback: Optional[HookCallback] = None) -> None:
+        self.callback = callback
+        self._stats: Dict[HookKey, HookStats] = {}
+
+    def wrap(self, kind: str, cl: Any, handler: Callable[..., Any]) -> Callable[..., Any]:
+        key = (kind, cl)
+        stats = self._stats.get(key)
+        if stats is None:
+            hook_name = getattr(handler, "__qualname__", None) or handler.__class__.__qualname__
+            stats = self._stats[key] = HookStats(hook_name)
+        callback = self.callback
+        perf_counter = time.perf_counter
+
+        @wraps(handler)
+        def _instrumented(*args: Any) -> Any:
+            failed = False
+            started = perf_counter()
+            try:
+                return handler(*args)
+            except Exception:
+                failed = True
+                stats.failures += 1
+                raise
+            finally:
+                elapsed = perf_counter() - started
+                stats.calls += 1
+                stats.total_time += elapsed
+                if callback is not None:
+                    callback(kind, cl, elapsed, failed)
+
+        _instrumented.__wrapped__ = handler  # type: ignore
+        return _instrumented
+
+    def snapshot(self) -> Dict[HookKey, HookStats]:
+        """Get a copy of collected stats omitting hooks that were resolved but never called."""
+        return {key: stats.copy() for key, stats in self._stats.items() if stats.calls}
+
+    def reset(self) -> None:
+        for stats in self._stats.values():
+            stats.calls, stats.failures, stats.total_time = 0, 0, 0.0
@@ -0,0 +1,87 @@
+from typing import Any
+from typing import Iterator
+from typing import List
+from typing import Mapping
+from typing import Sequence
+from typing import Type
+from typing import Union
+from typing import overload
+
+_missing = object()
+
+
+class LazyProxy:
+    """Stand-in for an attrs class instance structuring every field on first access.
+
+    Structured values are stored in instance `__dict__`, so subsequent access costs the same as with a regular object.
+    Nested attrs classes and lists of them become lazy too. Invalid fields raise StructureError on access only; use
+    `materialize` to get a regular attrs instance.
+    """
+
+    def __init__(self, converter: Any, data: Mapping, cl: Type) -> None:
+        self._lazy_converter = converter
+        self._lazy_data = data
+        self._lazy_cl = cl
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("_lazy_"):
+            raise AttributeError(name)
+        value = self._lazy_converter._structure_lazy_field(self, name)
+        self.__dict__[name] = value
+        return value
+
+    def __eq__(self, other: object) -> bool:
+        return materialize(self) == materialize(other)
+
+    def __repr__(self) -> str:
+        loaded = ", ".join(f"{k}={v!r}" for k, v in self.__dict__.items() if not k.startswith("_lazy_"))
+        return f"<lazy {self._lazy_cl.__qualname__}({loaded})>"
+
+
+class LazyList(Sequence):
+    """Stand-in for a list structuring every item on first access."""
+
+    def __init__(self, converter: Any, data: Sequence, item_type: Any) -> None:
+        self._lazy_converter = converter
+        self._lazy_data = data
+        self._lazy_item_type = item_type
+        self._lazy_items: List[Any] = [_missing] * len(data)
+
+    @overload
+    def __getitem__(self, index: int) -> Any:
+        ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[Any]:
+        ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Any:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self._lazy_items)))]
+
+        item = self._lazy_items[index]
+        if item is _missing:
+            item = self._lazy_items[index] = self._lazy_converter._structure_lazy_value(self._lazy_data[index], self._lazy_item_type)
+        return item
+
+    def __len__(self) -> int:
+        return len(self._lazy_items)
+
+    def __iter__(self) -> Iterator[Any]:
+        for index in range(len(self._lazy_items)):
+            yield self[index]
+
+    def __eq__(self, other: object) -> bool:
+        return materialize(self) == materialize(other)
+
+    def __repr__(self) -> str:
+        return f"<lazy list of {len(self._lazy_items)} items>"
+
+
+def materialize(obj: Any) -> Any:
+    """Structure lazy proxy or list completely; other objects are returned as is."""
+    if isinstance(obj, LazyProxy):
+        return obj._lazy_converter.structure(obj._lazy_data, obj._lazy_cl)
+    if isinstance(obj, LazyList):
+        return [materialize(item) for item in obj]
+    return obj
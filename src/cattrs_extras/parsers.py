@@ -0,0 +1,245 @@
+import re
+from datetime import date
+from datetime import datetime
+from datetime import timedelta
+from datetime import timezone
+from decimal import Decimal
+from functools import lru_cache
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Optional
+from typing import Tuple
+from typing import Type
+from typing import TypeVar
+
+import dateutil.parser
+
+T = TypeVar("T")  # pylint: disable=invalid-name
+Tier = Callable[[Any], Any]
+
+_NUMBER_RE = re.compile(r"\s*[+-]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?\s*")
+_ISO_RE = re.compile(r"\d{4}-\d{2}-\d{2}(?:[T ]\d{2}:\d{2}(?::\d{2}(?:\.\d{1,6})?)?)?(?:Z|[+-]\d{2}:?\d{2})?")
+
+_DURATION_UNITS: Dict[str, float] = {
+    **dict.fromkeys(("w", "wk", "wks", "week", "weeks"), 604800.0),
+    **dict.fromkeys(("d", "dy", "dys", "day", "days"), 86400.0),
+    **dict.fromkeys(("h", "hr", "hrs", "hour", "hours"), 3600.0),
+    **dict.fromkeys(("m", "min", "mins", "minute", "minutes"), 60.0),
+    **dict.fromkeys(("s", "sec", "secs", "second", "seconds"), 1.0),
+    **dict.fromkeys(("ms", "msec", "msecs", "millisecond", "milliseconds"), 0.001),
+    **dict.fromkeys(("us", "usec", "usecs", "microsecond", "microseconds"), 0.000001),
+}
+_DURATION_NUMBER = r"(?:\d+(?:\.\d*)?|\.\d+)"
+# NOTE: Longer units go first, so that `1min` is not matched as `1m` followed by garbage
+_DURATION_UNIT = "|".join(sorted(_DURATION_UNITS, key=lambda unit: (-len(unit), unit)))
+_DURATION_COMPONENT_RE = re.compile(rf"({_DURATION_NUMBER})\s*({_DURATION_UNIT})", re.IGNORECASE)
+_DURATION_RE = re.compile(
+    rf"""
+    \s*(?P<sign>[+-])?\s*
+    (?:
+        (?P<number>{_DURATION_NUMBER}(?:e[+-]?\d+)?)
+      | P(?:(?P<iso_weeks>{_DURATION_NUMBER})W)?(?:(?P<iso_days>{_DURATION_NUMBER})D)?
+        (?:T(?:(?P<iso_hours>{_DURATION_NUMBER})H)?(?:(?P<iso_minutes>{_DURATION_NUMBER})M)?(?:(?P<iso_seconds>{_DURATION_NUMBER})S)?)?
+      | (?:(?P<clock_days>\d+)\s*(?:d|days?),?\s+)?(?P<clock>\d+:\d{{2}}(?::\d{{2}})?(?:\.\d+)?)
+      | (?P<human>(?:{_DURATION_NUMBER}\s*(?:{_DURATION_UNIT})(?:\s*,\s*|\s+and\s+|\s*))+)
+    )
+    \s*
+    """,
+    re.IGNORECASE | re.VERBOSE,
+)
+_ISO_DURATION_GROUPS = (("iso_weeks", 604800.0), ("iso_days", 86400.0), ("iso_hours", 3600.0), ("iso_minutes", 60.0), ("iso_seconds", 1.0))
+
+
+def _to_epoch(obj: Any) -> Optional[float]:
+    if isinstance(obj, (int, float, Decimal)):
+        return float(obj)
+    if isinstance(obj, str) and _NUMBER_RE.fullmatch(obj):
+        return float(obj)
+    return None
+
+
+def _parse_datetime_passthrough(obj: Any) -> Optional[datetime]:
+    return obj if isinstance(obj, datetime) else None
+
+
+def _parse_datetime_epoch(obj: Any) -> Optional[datetime]:
+    timestamp = _to_epoch(obj)
+    if timestamp is None:
+        return None
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc)
+
+
+def _parse_datetime_isoformat(obj: Any) -> Optional[datetime]:
+    if not isinstance(obj, str) or not _ISO_RE.fullmatch(obj):
+        return None
+    # NOTE: `datetime.fromisoformat` doesn't accept `Z` suffix before Python 3.11
+    if obj[-1] == "Z":
+        obj = obj[:-1] + "+00:00"
+    try:
+        return datetime.fromisoformat(obj)
+    except ValueError:
+        return None
+
+
+def _parse_datetime_dateutil(obj: Any) -> Optional[datetime]:
+    if not isinstance(obj, str):
+        return None
+    try:
+        return dateutil.parser.parse(obj)
+    except (dateutil.parser.ParserError, OverflowError):
+        return None
+
+
+def _parse_date_passthrough(obj: Any) -> Optional[date]:
+    if isinstance(obj, datetime):
+        return obj.date()
+    return obj if isinstance(obj, date) else None
+
+
+def _parse_date_epoch(obj: Any) -> Optional[date]:
+    timestamp = _to_epoch(obj)
+    if timestamp is None:
+        return None
+    return date.fromtimestamp(timestamp)
+
+
+def _parse_date_isoformat(obj: Any) -> Optional[date]:
+    result = _parse_datetime_isoformat(obj)
+    return None if result is None else result.date()
+
+
+def _parse_date_dateutil(obj: Any) -> Optional[date]:
+    result = _parse_datetime_dateutil(obj)
+    return None if result is None else result.date()
+
+
+def _seconds_to_timedelta(seconds: float) -> Optional[timedelta]:
+    try:
+        return timedelta(seconds=seconds)
+    except (OverflowError, ValueError):
+        return None
+
+
+@lru_cache(maxsize=4096)
+def _parse_duration(obj: str) -> Optional[timedelta]:
+    """Parse a number of seconds, ISO 8601 duration (`PT1H30M`), clock (`1:30:00`) or human-readable (`1h 30m`) string.
+
+    Years and months of ISO 8601 durations are not supported, since their length is not fixed. Results of repeated
+    strings are cached.
+    """
+    match = _DURATION_RE.fullmatch(obj)
+    if match is None:
+        return None
+
+    groups = match.groupdict()
+    if groups["number"] is not None:
+        seconds = float(groups["number"])
+    elif groups["clock"] is not None:
+        parts = [float(part) for part in groups["clock"].split(":")]
+        # NOTE: Two parts are minutes and seconds, like in pytimeparse
+        seconds = sum(part * unit for part, unit in zip(reversed(parts), (1.0, 60.0, 3600.0)))
+        seconds += 86400.0 * float(groups["clock_days"] or 0)
+    elif groups["human"] is not None:
+        seconds = sum(float(number) * _DURATION_UNITS[unit.lower()] for number, unit in _DURATION_COMPONENT_RE.findall(groups["human"]))
+    else:
+        values = [(groups[name], unit) for name, unit in _ISO_DURATION_GROUPS if groups[name] is not None]
+        if not values:
+            return None
+        seconds = sum(float(value) * unit for value, unit in values)
+
+    return _seconds_to_timedelta(-seconds if groups["sign"] == "-" else seconds)
+
+
+def _parse_timedelta_passthrough(obj: Any) -> Optional[timedelta]:
+    return obj if isinstance(obj, timedelta) else None
+
+
+def _parse_timedelta_seconds(obj: Any) -> Optional[timedelta]:
+    if isinstance(obj, (int, float, Decimal)):
+        return _seconds_to_timedelta(float(obj))
+    return None
+
+
+def _parse_timedelta_duration(obj: Any) -> Optional[timedelta]:
+    return _parse_duration(obj) if isinstance(obj, str) else None
+
+
+class TieredParser:
+    """Parser trying tiers in order until one of them returns a result.
+
+    Tiers never raise on mismatch, so common inputs are parsed without handling exceptions. When `learn` is set, parser
+    remembers the tier that succeeded last time and tries it first. Use `copy()` to get an independent parser per field.
+
+    Tiers must accept disjoint inputs, so that trying the learned tier first gives the same result as trying them in
+    order; the `fallback` tier accepting anything the others don't is tried last and never learned.
+    """
+
+    type_name = "value"
+    tiers: Tuple[Tier, ...] = ()
+    fallback: Optional[Tier] = None
+
+    def __init__(self, learn: bool = False) -> None:
+        self.learn = learn
+        self.last_tier: Optional[Tier] = None
+
+    def __call__(self, obj: Any, cls: Optional[Type] = None) -> Any:  # pylint: disable=unused-argument
+        last_tier = self.last_tier
+        if last_tier is not None:
+            result = last_tier(obj)
+            if result is not None:
+                return result
+
+        for tier in self.tiers:
+            if tier is last_tier:
+                continue
+            result = tier(obj)
+            if result is not None:
+                if self.learn:
+                    self.last_tier = tier
+                return result
+
+        if self.fallback is not None:
+            result = self.fallback(obj)
+            if result is not None:
+                return result
+
+        raise ValueError(f"{obj!r} is not a valid {self.type_name}")
+
+    def copy(self: T) -> T:
+        return self.__class__(learn=self.learn)  # type: ignore
+
+
+class DatetimeParser(TieredParser):
+    """Tiered datetime parser: epoch timestamps, then ISO 8601/RFC 3339 strings, then dateutil as a last resort."""
+
+    type_name = "datetime"
+    tiers: Tuple[Tier, ...] = (
+        _parse_datetime_passthrough,
+        _parse_datetime_epoch,
+        _parse_datetime_isoformat,
+    )
+    fallback: Optional[Tier] = staticmethod(_parse_datetime_dateutil)  # type: ignore
+
+
+class DateParser(DatetimeParser):
+    """Tiered date parser, see `DatetimeParser`."""
+
+    type_name = "date"
+    tiers = (
+        _parse_date_passthrough,
+        _parse_date_epoch,
+        _parse_date_isoformat,
+    )
+    fallback = staticmethod(_parse_date_dateutil)  # type: ignore
+
+
+class TimedeltaParser(TieredParser):
+    """Tiered timedelta parser: numbers of seconds, then duration strings, see `_parse_duration` for supported formats."""
+
+    type_name = "timedelta"
+    tiers = (
+        _parse_timedelta_passthrough,
+        _parse_timedelta_seconds,
+        _parse_timedelta_duration,
+    )
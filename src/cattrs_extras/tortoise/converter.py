@@ -3,142 +3,880 @@ from contextlib import suppress
 from datetime import date
 from datetime import datetime
 from datetime import timedelta
-from types import ModuleType
+from decimal import Context
+from decimal import Decimal
+from functools import lru_cache
+from functools import partial
+from itertools import islice
+from typing import IO
 from typing import Any
+from typing import AsyncIterator
 from typing import Callable
 from typing import Dict
+from typing import FrozenSet
+from typing import Iterable
 from typing import List
 from typing import Mapping
 from typing import Optional
+from typing import Tuple
 from typing import Type
 from typing import Union
 
 import tortoise
+from tortoise import Tortoise
 from tortoise import fields
+from tortoise.query_utils import Prefetch
 from tortoise.queryset import QuerySet
 from typing_inspect import get_args  # type: ignore
+from typing_inspect import is_union_type
 
+from cattrs_extras.converter import BatchStructureError
 from cattrs_extras.converter import Converter
 from cattrs_extras.converter import StructureError
+from cattrs_extras.converter import T
+from cattrs_extras.converter import _make_dis_func
+from cattrs_extras.instrumentation import HookCallback
+from cattrs_extras.instrumentation import Instrumentation
 from cattrs_extras.tortoise.fields import ReversedCharEnumFieldInstance
 
 JSONType = Union[Dict[str, Any], List[Dict[str, Any]]]
 NoneType = type(None)
+# NOTE: Field names mapped to projections of related models; None means the whole field
+Projection = FrozenSet[Tuple[str, Any]]
+MEMO_MODES = ("ref", "reuse")
+# NOTE: Module name, list of module names or module names by app label as in `Tortoise.init`
+ModelModules = Union[str, Iterable[str], Mapping[str, Union[str, Iterable[str]]]]
+
+
+def _is_tortoise_model(cls: Any) -> bool:
+    return isinstance(cls, type) and issubclass(cls, tortoise.Model)
+
+
+def _is_tortoise_union(cls: Any) -> bool:
+    """Check whether a type is a Union of at least two Tortoise models, optionally with None."""
+    if not is_union_type(cls):
+        return False
+    members = [e for e in get_args(cls) if e is not NoneType]
+    return len(members) > 1 and all(_is_tortoise_model(e) for e in members)
+
+
+def _import_app_models(models: ModelModules) -> Dict[str, List[Type[tortoise.Model]]]:
+    """Import modules and get models defined or imported there by app label; label is empty when not given."""
+    app_modules = models if isinstance(models, Mapping) else {"": models}
+    return {
+        label: [
+            value
+            for name in ([names] if isinstance(names, str) else names)
+            for value in vars(importlib.import_module(name)).values()
+            if _is_tortoise_model(value)
+        ]
+        for label, names in app_modules.items()
+    }
+
+
+def _make_model_registry(app_models: Mapping[str, Iterable[Type[tortoise.Model]]]) -> Dict[str, Optional[Type[tortoise.Model]]]:
+    """Map `app.Model` references and bare model names to models; names found in several apps are mapped to None."""
+    registry: Dict[str, Optional[Type[tortoise.Model]]] = {}
+    for label, models in app_models.items():
+        for model in models:
+            name = model.__name__
+            if label:
+                registry[f"{label}.{name}"] = model
+            registry[name] = model if registry.get(name, model) is model else None
+    return registry
+
+
+@lru_cache(maxsize=256)
+def _parse_projection(paths: FrozenSet[str]) -> Projection:
+    """Convert dotted field paths, e.g. `author.name`, to a hashable tree."""
+    nested: Dict[str, Optional[List[str]]] = {}
+    for path in paths:
+        name, _, rest = path.partition(".")
+        if not rest:
+            nested[name] = None
+        elif nested.get(name, []) is not None:
+            nested.setdefault(name, []).append(rest)  # type: ignore
+    return frozenset((name, None if rest is None else _parse_projection(frozenset(rest))) for name, rest in nested.items())
+
+
+def _get_projection(paths: Optional[Iterable[str]]) -> Optional[Projection]:
+    return None if paths is None else _parse_projection(frozenset(paths))
+
+
+def _select_field(
+    field_name: str,
+    include: Optional[Projection],
+    exclude: Optional[Projection],
+) -> Optional[Tuple[Optional[Projection], Optional[Projection]]]:
+    """Get projections to apply to a related model of the field; None means the field is not selected."""
+    nested_include = nested_exclude = None
+    if include is not None:
+        include_map = dict(include)
+        if field_name not in include_map:
+            return None
+        nested_include = include_map[field_name]
+    if exclude is not None:
+        exclude_map = dict(exclude)
+        if field_name in exclude_map:
+            nested_exclude = exclude_map[field_name]
+            if nested_exclude is None:
+                return None
+    return nested_include, nested_exclude
 
 
 # TODO: Set datetime timezone awareness?
 # TODO: Ability to format timestamps as strings?
 class TortoiseConverter(Converter):
-    def __init__(self, models: str) -> None:
-        super().__init__()
-        self._models: ModuleType = importlib.import_module(models)
-        self.register_structure_hook(tortoise.Model, self._structure_tortoise_model)
-        self.register_unstructure_hook(tortoise.Model, self._unstructure_tortoise_model)
-
-    def _structure_tortoise_model(self, obj: Dict[str, Any], cls: Type[tortoise.Model]) -> tortoise.Model:
-
-        result_dict: Dict[str, Any] = {}
-        saved_in_db = False
-
-        for field_name, field in cls._meta.fields_map.items():
+    """Converter for Tortoise models.
+
+    `models` are used to resolve string references of relations before Tortoise is initialized: a module name, a list of
+    them or module names by app label as in `Tortoise.init`. If not set, models registered in `Tortoise.apps` are used.
+    """
+
+    def __init__(
+        self,
+        models: Optional[ModelModules] = None,
+        learn_datetime_formats: bool = False,
+        instrument: bool = False,
+        hook_callback: Optional[HookCallback] = None,
+        collect_errors: bool = False,
+        backend: str = "json",
+        decimal_context: Optional[Context] = None,
+        fixed_scale_decimals: bool = False,
+        scalar_cache_size: int = 0,
+        scalar_cache_ttl: Optional[float] = None,
+    ) -> None:
+        # NOTE: Cleared on every hook registration, including ones made by the base class constructor
+        self._projection_hooks: Dict[Tuple[Type, Optional[Projection], Optional[Projection], Optional[str]], Callable[..., JSONType]] = {}
+        self._values_hooks: Dict[Tuple[Type, Tuple[str, ...]], Callable[[Dict[str, Any]], Dict[str, Any]]] = {}
+        super().__init__(
+            learn_datetime_formats=learn_datetime_formats,
+            instrument=instrument,
+            hook_callback=hook_callback,
+            collect_errors=collect_errors,
+            backend=backend,
+            decimal_context=decimal_context,
+            fixed_scale_decimals=fixed_scale_decimals,
+            scalar_cache_size=scalar_cache_size,
+            scalar_cache_ttl=scalar_cache_ttl,
+        )
+        self._model_registry = None if models is None else _make_model_registry(_import_app_models(models))
+        self._related_models: Dict[fields.relational.RelationalField, Type[tortoise.Model]] = {}
+        self.register_structure_hook_factory(_is_tortoise_model, self._gen_structure_tortoise_model)
+        self.register_unstructure_hook_factory(_is_tortoise_model, self._gen_unstructure_tortoise_model)
+        self.register_structure_hook_factory(_is_tortoise_union, self._gen_attrs_union_structure)
+
+    def _gen_structure_tortoise_model(self, cls: Type[tortoise.Model]) -> Callable[..., tortoise.Model]:
+        """Generate a structuring function for a Tortoise model.
+
+        Field handlers are resolved once, result is cached by cattrs dispatch until the next hook registration.
+        """
+        fn_name = f"structure_{cls.__name__}"
+        globs: Dict[str, Any] = {
+            "cls": cls,
+            "structure": self.structure,
+            "StructureError": StructureError,
+            "missing": object(),
+        }
+        lines = [
+            f"def {fn_name}(obj, _):",
+            "    res = {}",
+            "    saved_in_db = False",
+            "    get = obj.get",
+        ]
+
+        # NOTE: Foreign key can be set either with a related model or with a value of its source field
+        counterparts = {}
+        for relation_name in cls._meta.fk_fields | cls._meta.o2o_fields:
+            source_field = cls._meta.fields_map[relation_name].source_field
+            if source_field:
+                counterparts[relation_name], counterparts[source_field] = source_field, relation_name
+
+        for i, (field_name, field) in enumerate(cls._meta.fields_map.items()):
+            # FIXME: tortoise.exceptions.ConfigurationError: You can"t set backward relations through init, change related model instead
+            # Should we try to hack it somehow or just ignore backward relations even if fetched?
+            if isinstance(field, fields.relational.BackwardFKRelation):
+                continue
 
-            field_value = obj.get(field_name)
+            name = repr(field_name)
+            indent = "    "
 
+            # NOTE: Every branch guarantees that the value is present and not None in the rest of the block, except the last one
+            value_is_set = True
             if field.pk and field.generated:
-                if field_value is not None:
-                    saved_in_db = True
-                else:
-                    continue
-
-            if all(
-                [
-                    field.null is False,
-                    field_value is None,
-                    not (isinstance(field, fields.DatetimeField) and field.auto_now_add),
-                ]
-            ):
-                raise StructureError(f'Cannot structure {cls.__qualname__}: "{field_name}" field is not nullable')
-
-            if field_name not in obj:
-                continue
+                lines.append(f"{indent}v = get({name})")
+                lines.append(f"{indent}if v is not None:")
+                indent += "    "
+                lines.append(f"{indent}saved_in_db = True")
+
+            # NOTE: Missing value will be set on save
+            elif field.null is False and isinstance(field, fields.DatetimeField) and field.auto_now_add:
+                lines.append(f"{indent}v = get({name})")
+                lines.append(f"{indent}if v is not None:")
+                indent += "    "
+
+            elif field.null is False and field_name in counterparts:
+                message = f'Cannot structure {cls.__qualname__}: "{field_name}" field is not nullable'
+                lines.append(f"{indent}v = get({name})")
+                lines.append(f"{indent}if v is None and get({counterparts[field_name]!r}) is None:")
+                lines.append(f"{indent}    raise StructureError({message!r})")
+                lines.append(f"{indent}if v is not None:")
+                indent += "    "
+
+            elif field.null is False:
+                message = f'Cannot structure {cls.__qualname__}: "{field_name}" field is not nullable'
+                lines.append(f"{indent}v = get({name})")
+                lines.append(f"{indent}if v is None:")
+                lines.append(f"{indent}    raise StructureError({message!r})")
 
-            known_type = None
-            if isinstance(field, fields.BooleanField):
-                known_type = Optional[bool] if field.null else bool
-            elif isinstance(field, fields.DatetimeField):
-                known_type = Optional[datetime] if field.null else datetime
-            elif isinstance(field, fields.DateField):
-                known_type = Optional[date] if field.null else date
-            elif isinstance(field, fields.TimeDeltaField):
-                known_type = Optional[timedelta] if field.null else timedelta
-            elif isinstance(
-                field,
-                (fields.data.CharEnumFieldInstance, ReversedCharEnumFieldInstance),
-            ):
-                known_type = Optional[field.enum_type] if field.null else field.enum_type
+            else:
+                value_is_set = False
+                lines.append(f"{indent}v = get({name}, missing)")
+                lines.append(f"{indent}if v is not missing:")
+                indent += "    "
 
+            known_type = self._get_known_type(field)
             if known_type is not None:
-                result_dict[field_name] = self.structure(
-                    obj=field_value,
-                    cl=known_type,  # type: ignore
-                )
-
-            # FIXME: tortoise.exceptions.ConfigurationError: You can"t set backward relations through init, change related model instead
-            # Should we try to hack it somehow or just ignore backward relations even if fetched?
-            elif isinstance(field, fields.relational.BackwardFKRelation):
-                continue
-
-            elif isinstance(field, fields.relational.RelationalField) and field_value:
-                # FIXME: Hinted as Type["Model"]
-                if isinstance(field.model, str):
-                    field_model = getattr(self._models, field.model.split(".")[-1])
+                if isinstance(field, fields.DecimalField):
+                    quantize = self._get_decimal_quantizer(field.decimal_places, field.max_digits)
+                    globs[f"h_{i}"] = self._get_decimal_structure_hook(known_type, quantize)
+                else:
+                    globs[f"h_{i}"] = self._get_field_structure_hook(known_type)
+                globs[f"t_{i}"] = known_type
+                if value_is_set and field.null is False:
+                    lines.append(f"{indent}res[{name}] = h_{i}(v, t_{i})")
                 else:
-                    field_model = field.model
+                    lines.append(f"{indent}res[{name}] = None if v is None else h_{i}(v, t_{i})")
 
-                related_model = self.structure(
-                    obj=field_value,
-                    cl=field_model,
-                )
-                related_model._saved_in_db = True
-                result_dict[field_name] = related_model
+            elif isinstance(field, fields.relational.RelationalField):
+                globs[f"m_{i}"] = self._get_related_model(field)
+                lines.append(f"{indent}if v:")
+                lines.append(f"{indent}    v = structure(v, m_{i})")
+                lines.append(f"{indent}    v._saved_in_db = True")
+                lines.append(f"{indent}res[{name}] = v")
 
             else:
-                result_dict[field_name] = field_value
+                lines.append(f"{indent}res[{name}] = v")
+
+        lines.append("    model = cls(**res)")
+        lines.append("    model._saved_in_db = saved_in_db")
+        lines.append("    return model")
+
+        return self._build_function(fn_name, lines, globs)
+
+    def unstructure(
+        self,
+        obj: Any,
+        unstructure_as: Any = None,
+        include: Optional[Iterable[str]] = None,
+        exclude: Optional[Iterable[str]] = None,
+        memo: Optional[str] = None,
+    ) -> Any:
+        """Unstructure an object; `include` and `exclude` select fields of Tortoise models, e.g. `{'title', 'author.name'}`.
+
+        Fields of related models are selected with dotted paths. A function is generated once per model and projection.
+        Projections are applied to every model of a list too.
+
+        `memo` makes unstructuring of object graphs with cycles or shared related models safe: with `ref` every model
+        met again is replaced with its primary key, with `reuse` the dict built for it with the same projection is reused,
+        while models still being unstructured, i.e. cycles, are replaced with primary keys. Models are tracked by identity
+        during a call.
+        """
+        if include is None and exclude is None and memo is None:
+            return super().unstructure(obj, unstructure_as)
+
+        include_projection, exclude_projection = _get_projection(include), _get_projection(exclude)
+        visited: Dict[int, Any] = {}
+        if isinstance(obj, (list, tuple)):
+            return [self._get_call_hook(item.__class__, include_projection, exclude_projection, memo, visited)(item) for item in obj]
+        cls = obj.__class__ if unstructure_as is None else unstructure_as
+        return self._get_call_hook(cls, include_projection, exclude_projection, memo, visited)(obj)
+
+    def _gen_unstructure_tortoise_model(
+        self,
+        cls: Type[tortoise.Model],
+        include: Optional[Projection] = None,
+        exclude: Optional[Projection] = None,
+        memo: Optional[str] = None,
+    ) -> Callable[..., JSONType]:
+        """Generate an unstructuring function for a Tortoise model, optionally limited to a projection.
+
+        Hooks are resolved for declared field types; values of any other type fall back to regular dispatch. With `memo`
+        mode set the function takes a dict of visited models as the second argument and passes it to related models.
+        """
+        unknown_fields = {name for projection in (include, exclude) for name, _ in projection or ()} - set(cls._meta.fields_map)
+        if unknown_fields:
+            raise ValueError(f"Cannot unstructure {cls.__qualname__}: unknown fields {', '.join(sorted(unknown_fields))}")
+
+        fn_name = f"unstructure_{cls.__name__}"
+        globs: Dict[str, Any] = {
+            "unstructure": self.unstructure,
+            "QuerySet": QuerySet,
+            "NoValuesFetched": tortoise.exceptions.NoValuesFetched,
+        }
+        if memo is None:
+            lines = [
+                f"def {fn_name}(obj):",
+                "    res = {}",
+            ]
+        elif memo == "ref":
+            # NOTE: Models are stored along with their ids to keep ids unique during a call
+            lines = [
+                f"def {fn_name}(obj, visited):",
+                "    key = id(obj)",
+                "    if key in visited:",
+                "        return obj.pk",
+                "    visited[key] = obj",
+                "    res = {}",
+            ]
+        else:
+            # NOTE: Models being unstructured are stored by id, complete dicts by id and projection of this function
+            lines = [
+                f"def {fn_name}(obj, visited):",
+                "    key = id(obj)",
+                "    done = visited.get((key, token))",
+                "    if done is not None:",
+                "        return done[1]",
+                "    if key in visited:",
+                "        return obj.pk",
+                "    visited[key] = obj",
+                "    res = {}",
+            ]
+            globs["token"] = object()
+
+        for i, (field_name, field) in enumerate(cls._meta.fields_map.items()):
+            selected = _select_field(field_name, include, exclude)
+            if selected is None:
+                continue
 
-        model = cls(**result_dict)
-        model._saved_in_db = saved_in_db
-        return model
+            name = repr(field_name)
+            lines.append(f"    v = getattr(obj, {name}, None)")
+
+            nested = selected != (None, None)
+            if nested and not isinstance(field, fields.relational.RelationalField):
+                raise ValueError(f'Cannot unstructure {cls.__qualname__}: "{field_name}" field is not a relation')
+            if memo is not None:
+                # NOTE: Resolved on call, since related models may refer back to this one
+                globs[f"p_{i}"] = partial(self._unstructure_visited, *selected, memo)
+                call = f"p_{i}({{}}, visited)"
+            elif nested:
+                globs[f"p_{i}"] = self._get_projection_hook(self._get_related_model(field), *selected)  # type: ignore
+                call = f"p_{i}({{}})"
+            else:
+                call = ""
 
-    def _unstructure_tortoise_model(self, obj: tortoise.Model) -> JSONType:
+            # NOTE: `related_objects` of backward relation is an empty list until fetched
+            if isinstance(field, fields.relational.BackwardFKRelation):
+                lines.append("    if v._fetched:")
+                if call:
+                    lines.append(f"        res[{name}] = [{call.format('o')} for o in v.related_objects]")
+                else:
+                    lines.append(f"        res[{name}] = unstructure(v.related_objects)")
+                continue
 
-        result_dict = {}
+            if isinstance(field, fields.relational.RelationalField):
+                lines.append("    if not isinstance(v, QuerySet):")
+                lines.append("        try:")
+                if call:
+                    lines.append(f"            res[{name}] = None if v is None else {call.format('v')}")
+                else:
+                    lines.append(f"            res[{name}] = unstructure(v)")
+                lines.append("        except NoValuesFetched:")
+                lines.append("            pass")
+                continue
 
-        for field_name, field in obj.__class__._meta.fields_map.items():
+            lines.append(f"    res[{name}] = {self._gen_unstructure_field_expression(field, i, 'v', globs)}")
+
+        if memo == "reuse":
+            lines.append("    del visited[key]")
+            lines.append("    visited[key, token] = obj, res")
+        lines.append("    return res")
+
+        return self._build_function(fn_name, lines, globs)
+
+    def _gen_unstructure_tortoise_row(
+        self,
+        cls: Type[tortoise.Model],
+        columns: Tuple[str, ...],
+    ) -> Callable[[Dict[str, Any]], Dict[str, Any]]:
+        """Generate a function unstructuring a `values` row, a dict of raw values by column name."""
+        fn_name = f"unstructure_row_{cls.__name__}"
+        globs: Dict[str, Any] = {"unstructure": self.unstructure}
+        lines = [f"def {fn_name}(row):"]
+        lines.extend(f"    v_{i} = row[{column!r}]" for i, column in enumerate(columns))
+        lines.append("    return {")
+        for i, column in enumerate(columns):
+            field = cls._meta.fields_map[column]
+            lines.append(f"        {column!r}: {self._gen_unstructure_field_expression(field, i, f'v_{i}', globs)},")
+        lines.append("    }")
+
+        return self._build_function(fn_name, lines, globs)
+
+    def _gen_unstructure_field_expression(self, field: fields.Field, i: int, value: str, globs: Dict[str, Any]) -> str:
+        """Get an expression unstructuring a data field value; values of other types than declared fall back to dispatch."""
+        field_type = self._get_field_type(field)
+        if field_type is None:
+            return f"unstructure({value})"
+
+        if self._fixed_scale_decimals and isinstance(field, fields.DecimalField):
+            quantize = self._get_decimal_quantizer(field.decimal_places, field.max_digits)
+            globs[f"h_{i}"] = self._get_decimal_unstructure_hook(quantize)
+            return f"h_{i}({value})"
+
+        globs[f"t_{i}"] = field_type
+        handler = self._unstructure_func.dispatch(field_type)
+        if handler == self._unstructure_identity:
+            return f"{value} if {value}.__class__ is t_{i} else unstructure({value})"
+        globs[f"h_{i}"] = handler
+        return f"h_{i}({value}) if {value}.__class__ is t_{i} else unstructure({value})"
+
+    def structure_columns(self, columns: Any, cl: Type[T]) -> List[T]:
+        """Structure attrs class instances or Tortoise models from columns, see `Converter.structure_columns`.
+
+        Relations are not structured; use foreign key source fields like `author_id` instead. Models with a generated
+        primary key set are marked as saved in database, as with `structure`.
+        """
+        models = super().structure_columns(columns, cl)
+        if _is_tortoise_model(cl) and cl._meta.pk.generated:  # type: ignore
+            for model in models:
+                model._saved_in_db = model.pk is not None  # type: ignore
+        return models
+
+    async def iter_unstructure_queryset(
+        self,
+        queryset: QuerySet,
+        depth: int = 1,
+        batch_size: Optional[int] = None,
+        include: Optional[Iterable[str]] = None,
+        exclude: Optional[Iterable[str]] = None,
+        memo: Optional[str] = None,
+    ) -> AsyncIterator[JSONType]:
+        """Fetch models with relations up to `depth` levels deep and yield them unstructured one by one.
+
+        Every relation path is prefetched with a single query per batch. If `batch_size` is set, models are fetched in
+        batches with LIMIT/OFFSET, so queryset should be ordered.
+
+        With `include` or `exclude` set only selected columns are fetched with `.only()` on every level; relations listed
+        in `include` are fetched regardless of `depth`, see `unstructure` for path syntax and `memo` modes. Visited
+        models are tracked across all yielded items.
+        """
+        include_projection, exclude_projection = _get_projection(include), _get_projection(exclude)
+        handler = self._get_call_hook(queryset.model, include_projection, exclude_projection, memo, {})
+        if include_projection is None and exclude_projection is None:
+            queryset = queryset.prefetch_related(*self._get_prefetch_paths(queryset.model, depth))
+        else:
+            queryset = self._project_queryset(queryset, depth, include_projection, exclude_projection)
+
+        if batch_size is None:
+            for model in await queryset:
+                yield handler(model)
+            return
+
+        offset = 0
+        while True:
+            batch = await queryset.offset(offset).limit(batch_size)
+            for model in batch:
+                yield handler(model)
+            if len(batch) < batch_size:
+                return
+            offset += batch_size
+
+    async def iter_unstructure_queryset_to(
+        self,
+        fp: IO,
+        queryset: QuerySet,
+        depth: int = 1,
+        batch_size: Optional[int] = 1000,
+        include: Optional[Iterable[str]] = None,
+        exclude: Optional[Iterable[str]] = None,
+        memo: Optional[str] = None,
+        format: str = "jsonl",  # pylint: disable=redefined-builtin
+    ) -> int:
+        """Write models yielded by `iter_unstructure_queryset` to a text or binary file-like object one at a time.
+
+        Only a single batch of models is kept in memory, so queryset should be ordered. Returns the number of written
+        records.
+        """
+        write = self._get_stream_writer(fp, format)
+        written = 0
+
+        async for data in self.iter_unstructure_queryset(queryset, depth, batch_size, include, exclude, memo):
+            write(data)
+            written += 1
+
+        return written
+
+    async def unstructure_queryset(
+        self,
+        queryset: QuerySet,
+        depth: int = 1,
+        include: Optional[Iterable[str]] = None,
+        exclude: Optional[Iterable[str]] = None,
+        memo: Optional[str] = None,
+    ) -> List[JSONType]:
+        """Fetch models with relations up to `depth` levels deep and unstructure them."""
+        return [item async for item in self.iter_unstructure_queryset(queryset, depth, include=include, exclude=exclude, memo=memo)]
+
+    async def iter_unstructure_values(
+        self,
+        queryset: QuerySet,
+        batch_size: Optional[int] = None,
+        include: Optional[Iterable[str]] = None,
+        exclude: Optional[Iterable[str]] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Fetch rows with `values` and yield them unstructured without creating model instances.
+
+        Only data fields and foreign key source fields are fetched, so the result is the same as of unstructuring models
+        without relations. `include` and `exclude` select top-level fields, see `iter_unstructure_queryset` for batches.
+        """
+        model = queryset.model
+        columns = self._get_values_columns(model, _get_projection(include), _get_projection(exclude))
+
+        handler = self._get_values_hook(model, columns)
+
+        if batch_size is None:
+            for row in await queryset.values(*columns):
+                yield handler(row)
+            return
+
+        offset = 0
+        while True:
+            batch = await queryset.offset(offset).limit(batch_size).values(*columns)
+            for row in batch:
+                yield handler(row)
+            if len(batch) < batch_size:
+                return
+            offset += batch_size
+
+    async def unstructure_values(
+        self,
+        queryset: QuerySet,
+        include: Optional[Iterable[str]] = None,
+        exclude: Optional[Iterable[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Fetch rows with `values` and unstructure them without creating model instances."""
+        return [item async for item in self.iter_unstructure_values(queryset, include=include, exclude=exclude)]
+
+    async def load_into_db(self, objs: Iterable[Dict[str, Any]], cls: Type[tortoise.Model], batch_size: int = 1000) -> int:
+        """Structure records in batches and insert them with a single `bulk_create` query per batch.
+
+        Foreign keys must reference already inserted rows, either by `<field>_id` value or by a nested object with primary
+        key; referenced primary keys are checked with a single query per relation and batch. Batches are inserted in order,
+        so records can reference rows from previous batches. Wrap the call in a transaction to make it atomic. Returns the
+        number of inserted rows.
+        """
+        fk_fields: List[Tuple[str, str, Type[tortoise.Model], str, bool]] = []
+        for field_name in sorted(cls._meta.fk_fields | cls._meta.o2o_fields):
+            field: Any = cls._meta.fields_map[field_name]
+            fk_fields.append((field_name, field.source_field, field.related_model, field.to_field_instance.model_field_name, field.null))
+        objs_iter = iter(objs)
+        offset = 0
+
+        while True:
+            batch = list(islice(objs_iter, batch_size))
+            if not batch:
+                return offset
+
+            try:
+                models = self.structure_many(batch, cls)
+            except BatchStructureError as exc:
+                raise BatchStructureError(cls, {offset + index: error for index, error in exc.errors.items()}) from None
+
+            for field_name, source_field, related_model, to_field, null in fk_fields:
+                values = [getattr(model, source_field) for model in models]
+                referenced = {value for value in values if value is not None}
+                if referenced:
+                    referenced = set(await related_model.filter(**{f"{to_field}__in": referenced}).values_list(to_field, flat=True))
+                for index, value in enumerate(values):
+                    if value not in referenced and (value is not None or not null):
+                        raise StructureError(
+                            f"Cannot structure {cls.__qualname__}: "
+                            f'item {offset + index} doesn\'t reference an existing row in "{field_name}"'
+                        )
+
+            await cls.bulk_create(models)
+            offset += len(models)
+
+    @classmethod
+    def _get_prefetch_paths(cls, model: Type[tortoise.Model], depth: int, reverse_name: Optional[str] = None) -> List[str]:
+        """Get `prefetch_related` arguments for foreign keys and backward relations of a model.
+
+        Relation leading back to the model we came from is skipped to avoid fetching the same rows again.
+        """
+        if depth < 1:
+            return []
+
+        meta = model._meta
+        paths = []
+        for field_name in sorted(meta.fk_fields | meta.backward_fk_fields):
+            if field_name == reverse_name:
+                continue
 
-            field_value = getattr(obj, field_name, None)
+            field: Any = meta.fields_map[field_name]
+            paths.append(field_name)
+            paths.extend(
+                f"{field_name}__{path}"
+                for path in cls._get_prefetch_paths(field.related_model, depth - 1, cls._get_reverse_name(model, field_name))
+            )
 
-            if isinstance(field_value, QuerySet):
+        return paths
+
+    @classmethod
+    def _project_queryset(
+        cls,
+        queryset: QuerySet,
+        depth: int,
+        include: Optional[Projection],
+        exclude: Optional[Projection],
+        reverse_name: Optional[str] = None,
+        required_field: Optional[str] = None,
+    ) -> QuerySet:
+        """Limit queryset columns to a projection and prefetch selected relations with projected querysets.
+
+        Primary key and source fields of foreign keys are always fetched, since relations are matched by them.
+        """
+        meta = queryset.model._meta
+        columns = [meta.pk_attr]
+        if required_field is not None:
+            columns.append(required_field)
+        prefetches = []
+
+        for field_name in meta.fields_map:
+            selected = _select_field(field_name, include, exclude)
+            if selected is None:
+                continue
+            field: Any = meta.fields_map[field_name]
+            if field_name in meta.fk_fields:
+                columns.append(field.source_field)
+            elif field_name in meta.fields_db_projection:
+                columns.append(field_name)
+            if field_name not in meta.fk_fields | meta.backward_fk_fields:
+                continue
+            if include is None and (depth < 1 or field_name == reverse_name):
                 continue
 
-            if isinstance(field, fields.relational.BackwardFKRelation):
-                with suppress(tortoise.exceptions.NoValuesFetched):
-                    result_dict[field_name] = self.unstructure(field_value.related_objects)  # type: ignore
+            related_queryset = cls._project_queryset(
+                field.related_model.all(),
+                depth - 1,
+                *selected,
+                reverse_name=cls._get_reverse_name(queryset.model, field_name),
+                required_field=field.relation_field if field_name in meta.backward_fk_fields else None,
+            )
+            prefetches.append(Prefetch(field_name, related_queryset))
 
-            elif isinstance(field, fields.relational.RelationalField):
-                with suppress(tortoise.exceptions.NoValuesFetched):
-                    result_dict[field_name] = self.unstructure(field_value)
+        return queryset.only(*dict.fromkeys(columns)).prefetch_related(*prefetches)
+
+    @staticmethod
+    def _get_reverse_name(model: Type[tortoise.Model], field_name: str) -> Optional[str]:
+        """Get name of relation leading back from the related model of foreign key or backward relation."""
+        field: Any = model._meta.fields_map[field_name]
+        if field_name in model._meta.fk_fields:
+            return field.related_name
+        related_meta = field.related_model._meta
+        return next((name for name in related_meta.fk_fields if related_meta.fields_map[name].source_field == field.relation_field), None)
 
+    @staticmethod
+    def _get_values_columns(
+        model: Type[tortoise.Model],
+        include: Optional[Projection],
+        exclude: Optional[Projection],
+    ) -> Tuple[str, ...]:
+        """Get columns to fetch with `values`; relations can't be selected."""
+        meta = model._meta
+        unknown_fields = {name for projection in (include, exclude) for name, _ in projection or ()} - set(meta.fields_map)
+        if unknown_fields:
+            raise ValueError(f"Cannot unstructure {model.__qualname__}: unknown fields {', '.join(sorted(unknown_fields))}")
+
+        columns = []
+        for field_name in meta.fields_map:
+            selected = _select_field(field_name, include, exclude)
+            if selected is None:
+                continue
+            if field_name in meta.fields_db_projection and selected == (None, None):
+                columns.append(field_name)
+            elif include is not None:
+                raise ValueError(f'Cannot unstructure {model.__qualname__}: "{field_name}" field can\'t be fetched as values')
+        return tuple(columns)
+
+    def _get_values_hook(self, model: Type[tortoise.Model], columns: Tuple[str, ...]) -> Callable[[Dict[str, Any]], Dict[str, Any]]:
+        key = (model, columns)
+        try:
+            return self._values_hooks[key]
+        except KeyError:
+            hook = self._values_hooks[key] = self._gen_unstructure_tortoise_row(model, columns)
+            return hook
+
+    def _get_projection_hook(
+        self,
+        cls: Any,
+        include: Optional[Projection],
+        exclude: Optional[Projection],
+        memo: Optional[str] = None,
+    ) -> Callable[..., JSONType]:
+        if include is None and exclude is None and memo is None:
+            return self._unstructure_func.dispatch(cls)
+        if not _is_tortoise_model(cls):
+            raise ValueError(f"Cannot unstructure {cls}: fields can be selected and models tracked for Tortoise models only")
+
+        key = (cls, include, exclude, memo)
+        try:
+            return self._projection_hooks[key]
+        except KeyError:
+            hook = self._projection_hooks[key] = self._gen_unstructure_tortoise_model(cls, include, exclude, memo)
+            return hook
+
+    def _get_call_hook(
+        self,
+        cls: Any,
+        include: Optional[Projection],
+        exclude: Optional[Projection],
+        memo: Optional[str],
+        visited: Dict[int, Any],
+    ) -> Callable[[Any], JSONType]:
+        """Get a hook taking a single object; hooks tracking visited models are bound to a dict shared during a call."""
+        if memo is None:
+            return self._get_projection_hook(cls, include, exclude)
+        if memo not in MEMO_MODES:
+            raise ValueError(f"Unsupported memo mode: {memo}")
+        return partial(self._get_projection_hook(cls, include, exclude, memo), visited=visited)
+
+    def _unstructure_visited(
+        self,
+        include: Optional[Projection],
+        exclude: Optional[Projection],
+        memo: str,
+        obj: tortoise.Model,
+        visited: Dict[int, Any],
+    ) -> JSONType:
+        return self._get_projection_hook(obj.__class__, include, exclude, memo)(obj, visited)
+
+    def _record_registration(self, method: str, *args: Any) -> None:
+        super()._record_registration(method, *args)
+        self._projection_hooks.clear()
+        self._values_hooks.clear()
+
+    def _set_instrumentation(self, instrumentation: Optional[Instrumentation]) -> None:
+        super()._set_instrumentation(instrumentation)
+        self._projection_hooks.clear()
+        self._values_hooks.clear()
+
+    def _get_column_fields(self, cl: Type) -> List[Tuple[str, Any]]:
+        """Get names and types of data fields of Tortoise models, including foreign key source fields like `author_id`."""
+        if not _is_tortoise_model(cl):
+            return super()._get_column_fields(cl)
+        columns = []
+        for field_name, field in cl._meta.fields_map.items():
+            if isinstance(field, fields.relational.RelationalField):
+                continue
+            field_type = self._get_field_type(field) or Any
+            columns.append((field_name, Optional[field_type] if field.null else field_type))
+        return columns
+
+    def _get_column_decimal_hooks(self, cl: Type) -> Dict[str, Callable[[Any], Any]]:
+        """Get fixed-scale unstructure hooks of DecimalFields of Tortoise models by name."""
+        if not _is_tortoise_model(cl):
+            return super()._get_column_decimal_hooks(cl)
+        return {
+            field_name: self._get_decimal_unstructure_hook(self._get_decimal_quantizer(field.decimal_places, field.max_digits))
+            for field_name, field in cl._meta.fields_map.items()
+            if isinstance(field, fields.DecimalField)
+        }
+
+    def _get_column_structure_fields(self, cl: Type) -> List[Tuple[str, str, Any, Optional[Callable[[Any, Type], Any]], bool]]:
+        """Get data fields of Tortoise models; required ones are the same as in `_gen_structure_tortoise_model`."""
+        if not _is_tortoise_model(cl):
+            return super()._get_column_structure_fields(cl)
+        columns: List[Tuple[str, str, Any, Optional[Callable[[Any, Type], Any]], bool]] = []
+        for field_name, field in cl._meta.fields_map.items():
+            if isinstance(field, fields.relational.RelationalField):
+                continue
+            required = not field.null and not (field.pk and field.generated)
+            if isinstance(field, fields.DatetimeField) and field.auto_now_add:
+                required = False
+            known_type = self._get_known_type(field)
+            if known_type is None:
+                columns.append((field_name, field_name, Any, None, required))
+                continue
+            field_type: Any = Optional[known_type] if field.null else known_type
+            if isinstance(field, fields.DecimalField):
+                hook = self._get_decimal_structure_hook(field_type, self._get_decimal_quantizer(field.decimal_places, field.max_digits))
             else:
-                result_dict[field_name] = self.unstructure(field_value)
+                hook = self._get_field_structure_hook(field_type)
+            columns.append((field_name, field_name, field_type, hook, required))
+        return columns
+
+    def _get_type_dependencies(self, type_: Any) -> List[Any]:
+        dependencies = super()._get_type_dependencies(type_)
+        if not _is_tortoise_model(type_):
+            return dependencies
+
+        for field in type_._meta.fields_map.values():
+            if isinstance(field, fields.relational.RelationalField):
+                with suppress(StructureError):
+                    dependencies.append(self._get_related_model(field))
+                if isinstance(field, fields.relational.BackwardFKRelation):
+                    dependencies.append(list)
+                continue
+            for field_type in (self._get_known_type(field), self._get_field_type(field)):
+                if field_type is not None:
+                    dependencies.append(field_type)
+        return dependencies
+
+    @staticmethod
+    def _get_known_type(field: fields.Field) -> Optional[Type]:
+        """Get type to structure field value to; None means the value is passed as is."""
+        if isinstance(field, fields.BooleanField):
+            return bool
+        if isinstance(field, fields.DatetimeField):
+            return datetime
+        if isinstance(field, fields.DateField):
+            return date
+        if isinstance(field, fields.TimeDeltaField):
+            return timedelta
+        if isinstance(field, fields.DecimalField):
+            return Decimal
+        if isinstance(field, (fields.data.CharEnumFieldInstance, ReversedCharEnumFieldInstance)):
+            return field.enum_type
+        return None
+
+    @staticmethod
+    def _get_field_type(field: fields.Field) -> Optional[Type]:
+        """Get Python type of data field value if it's known beforehand."""
+        if isinstance(field, (fields.data.CharEnumFieldInstance, ReversedCharEnumFieldInstance)):
+            return field.enum_type
+        if isinstance(field.field_type, type):
+            return field.field_type
+        return None
+
+    def _get_related_model(self, field: fields.relational.RelationalField) -> Type[tortoise.Model]:
+        # NOTE: `related_model` is set on Tortoise initialization, `model` is a model the field belongs to
+        if field.related_model is not None:
+            return field.related_model
+        try:
+            return self._related_models[field]
+        except KeyError:
+            pass
+
+        registry = self._get_model_registry()
+        model = registry.get(field.model_name) or registry.get(field.model_name.split(".")[-1])
+        if model is None:
+            raise StructureError(f"Cannot resolve related model {field.model_name}: not found or ambiguous")
+        self._related_models[field] = model
+        return model
 
-        return result_dict
+    def _get_model_registry(self) -> Dict[str, Optional[Type[tortoise.Model]]]:
+        if self._model_registry is not None:
+            return self._model_registry
+        if not Tortoise.apps:
+            raise StructureError("Cannot resolve related models: Tortoise is not initialized and models are not given")
+        self._model_registry = _make_model_registry({label: models.values() for label, models in Tortoise.apps.items()})
+        return self._model_registry
 
-    # FIXME: super() copypaste
     @staticmethod
     def _get_dis_func(union: Type) -> Callable[..., Type]:
 
         with suppress(StructureError):
-            return super()._get_dis_func(union)
+            return Converter._get_dis_func(union)
 
         union_types = get_args(union)
         if NoneType in union_types:  # type: ignore
@@ -154,18 +892,4 @@ class TortoiseConverter(Converter):
             raise StructureError(f"Cannot structure {union}: at least two classes required.")
 
         cls_and_attrs = [(cl, set(cl._meta.fields)) for cl in union_types]
-
-        if len([attrs for _, attrs in cls_and_attrs if len(attrs) == 0]) > 1:
-            raise StructureError(f"Cannot structure {union}: at least two classes have no attributes.")
-
-        cls_and_attrs.sort(key=lambda c_a: len(c_a[1]))
-
-        def _dis_func(data: Mapping) -> Type:
-            if not isinstance(data, Mapping):
-                raise StructureError(f"Cannot structure {union}: only mappings are supported as input.")
-            for cls, cls_keys in cls_and_attrs:
-                if all([data_key in cls_keys for data_key in data]):
-                    return cls
-            raise StructureError(f"Cannot structure {union}: {data} does not match any of generic arguments")
-
-        return _dis_func
+        return _make_dis_func(union, cls_and_attrs)
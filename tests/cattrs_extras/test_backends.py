@@ -0,0 +1,129 @@
+import io
+import unittest
+from datetime import date
+from datetime import datetime
+from datetime import timedelta
+from datetime import timezone
+from decimal import Decimal
+from typing import Optional
+
+from attr import dataclass
+
+from cattrs_extras.converter import Converter
+from cattrs_extras.tortoise.converter import TortoiseConverter
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore
+
+try:
+    import msgpack  # type: ignore
+except ImportError:  # pragma: no cover
+    msgpack = None  # type: ignore
+
+
+@dataclass(kw_only=True)
+class SomeDataclass:
+    decimal_value: Decimal
+    datetime_value: datetime
+    date_value: date
+    timedelta_value: timedelta
+    aware_datetime_value: Optional[datetime] = None
+
+
+def make_obj() -> SomeDataclass:
+    return SomeDataclass(
+        decimal_value=Decimal("1.50"),
+        datetime_value=datetime(2020, 1, 2, 3, 4, 5, 6),
+        date_value=date(2020, 1, 2),
+        timedelta_value=timedelta(seconds=90),
+        aware_datetime_value=datetime(2020, 1, 2, 3, 4, 5, tzinfo=timezone(timedelta(hours=3))),
+    )
+
+
+class BackendsTest(unittest.TestCase):
+    def test_json(self):
+        # Arrange
+        converter = Converter()
+
+        # Act
+        data = converter.dumps(make_obj())
+        result = converter.loads(data, SomeDataclass)
+
+        # Assert
+        self.assertTrue(data.startswith(b'{"decimal_value":"1.50","datetime_value":'))
+        self.assertIn(b'"date_value":1577923200.0,"timedelta_value":90.0,"aware_datetime_value":1577923445.0}', data)
+        self.assertEqual(make_obj().aware_datetime_value, result.aware_datetime_value)
+
+    @unittest.skipIf(orjson is None, "orjson is not installed")
+    def test_orjson(self):
+        # Arrange
+        converter = Converter.for_orjson()
+
+        # Act
+        unstructured = converter.unstructure(make_obj())
+        data = converter.dumps(make_obj())
+        result = converter.loads(data, SomeDataclass)
+
+        # Assert
+        self.assertIs(make_obj().datetime_value.__class__, unstructured["datetime_value"].__class__)
+        self.assertEqual("1.50", unstructured["decimal_value"])
+        self.assertEqual(
+            b'{"decimal_value":"1.50","datetime_value":"2020-01-02T03:04:05.000006","date_value":"2020-01-02","timedelta_value":90.0,'
+            b'"aware_datetime_value":"2020-01-02T03:04:05+03:00"}',
+            data,
+        )
+        self.assertEqual(make_obj(), result)
+
+    @unittest.skipIf(msgpack is None, "msgpack is not installed")
+    def test_msgpack(self):
+        # Arrange
+        converter = Converter.for_msgpack()
+
+        # Act
+        unstructured = converter.unstructure(make_obj())
+        result = converter.loads(converter.dumps(make_obj()), SomeDataclass)
+
+        # Assert
+        self.assertEqual(Decimal("1.50"), unstructured["decimal_value"])
+        self.assertEqual(make_obj(), result)
+        self.assertEqual(timezone.utc, result.aware_datetime_value.tzinfo)
+
+    @unittest.skipIf(msgpack is None, "msgpack is not installed")
+    def test_msgpack_stream(self):
+        # Arrange
+        converter = Converter.for_msgpack()
+
+        # Act, Assert
+        with self.assertRaises(ValueError) as ctx:
+            converter.iter_unstructure_to(io.BytesIO(), [make_obj()])
+        self.assertEqual("Stream format jsonl is not supported by msgpack backend", str(ctx.exception))
+
+    @unittest.skipIf(orjson is None, "orjson is not installed")
+    def test_orjson_stream(self):
+        # Arrange
+        converter = Converter.for_orjson()
+        fp = io.StringIO()
+
+        # Act
+        converter.iter_unstructure_to(fp, [make_obj(), make_obj()])
+        fp.seek(0)
+        result = list(converter.iter_structure(fp, SomeDataclass))
+
+        # Assert
+        self.assertEqual([make_obj(), make_obj()], result)
+
+    @unittest.skipIf(orjson is None, "orjson is not installed")
+    def test_tortoise_profile(self):
+        # Act
+        converter = TortoiseConverter.for_orjson("cattrs_extras.tortoise.model")
+
+        # Assert
+        self.assertIsInstance(converter, TortoiseConverter)
+        self.assertEqual("orjson", converter._backend.name)
+
+    def test_unsupported(self):
+        # Act, Assert
+        with self.assertRaises(ValueError):
+            Converter(backend="yaml")
@@ -0,0 +1,260 @@
+import unittest
+from datetime import date
+from datetime import datetime
+from datetime import timedelta
+from datetime import timezone
+from decimal import Decimal
+from typing import List
+from typing import Optional
+from unittest.mock import patch
+
+from attr import dataclass
+
+from cattrs_extras.columns import Categorical
+from cattrs_extras.converter import Converter
+from cattrs_extras.converter import StructureError
+from cattrs_extras.parsers import DatetimeParser
+from cattrs_extras.tortoise.converter import TortoiseConverter
+from tests.cattrs_extras.test_converter import SomeLedgerDataclass
+from tests.cattrs_extras.test_tortoise import SomeEnum
+from tests.cattrs_extras.test_tortoise import SomeModel
+from tests.cattrs_extras.test_tortoise import SomeRequiredModel
+from tests.cattrs_extras.test_tortoise import SomeReversedEnum
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None  # type: ignore
+
+try:
+    import pyarrow  # type: ignore
+except ImportError:  # pragma: no cover
+    pyarrow = None  # type: ignore
+
+
+@dataclass(kw_only=True)
+class SomeDataclass:
+    int_value: int
+    optional_int_value: Optional[int]
+    float_value: Optional[float]
+    datetime_value: Optional[datetime]
+    date_value: date
+    timedelta_value: timedelta
+    enum_value: Optional[SomeEnum]
+    decimal_value: Optional[Decimal]
+    list_value: List[str]
+
+
+def make_objs() -> List[SomeDataclass]:
+    return [
+        SomeDataclass(
+            int_value=1,
+            optional_int_value=1,
+            float_value=1.5,
+            datetime_value=datetime(2020, 1, 2, 3, 4, 5, tzinfo=timezone(timedelta(hours=3))),
+            date_value=date(2020, 1, 2),
+            timedelta_value=timedelta(seconds=1.5),
+            enum_value=SomeEnum.K1,
+            decimal_value=Decimal("1.5"),
+            list_value=["a"],
+        ),
+        SomeDataclass(
+            int_value=2,
+            optional_int_value=None,
+            float_value=None,
+            datetime_value=None,
+            date_value=date(2020, 1, 3),
+            timedelta_value=timedelta(),
+            enum_value=None,
+            decimal_value=None,
+            list_value=["b"],
+        ),
+    ]
+
+
+@unittest.skipIf(numpy is None, "numpy is not installed")
+class ColumnsTest(unittest.TestCase):
+    def test_unstructure_columns(self):
+        # Arrange
+        converter = Converter()
+
+        # Act
+        columns = converter.unstructure_columns(iter(make_objs()), SomeDataclass)
+
+        # Assert
+        self.assertEqual("int64", columns["int_value"].dtype)
+        self.assertEqual([1, 2], columns["int_value"].tolist())
+        self.assertEqual(object, columns["optional_int_value"].dtype)
+        self.assertEqual([1, None], columns["optional_int_value"].tolist())
+        self.assertTrue(numpy.isnan(columns["float_value"][1]))
+        self.assertEqual(
+            numpy.array(["2020-01-02T00:04:05", "NaT"], dtype="datetime64[us]").tolist(),
+            columns["datetime_value"].tolist(),
+        )
+        self.assertEqual("datetime64[D]", columns["date_value"].dtype)
+        self.assertEqual("timedelta64[us]", columns["timedelta_value"].dtype)
+        self.assertEqual([1500000, 0], columns["timedelta_value"].astype("int64").tolist())
+        self.assertIsInstance(columns["enum_value"], Categorical)
+        self.assertEqual([0, -1], columns["enum_value"].codes.tolist())
+        self.assertEqual(["V1"], columns["enum_value"].categories)
+        self.assertEqual(["1.5", None], columns["decimal_value"].tolist())
+        self.assertEqual((2,), columns["list_value"].shape)
+        self.assertEqual([["a"], ["b"]], columns["list_value"].tolist())
+
+    def test_unstructure_columns_fixed_scale_decimals(self):
+        # Arrange
+        converter = Converter(fixed_scale_decimals=True)
+        models = [SomeModel(id=1, decimal=Decimal("1.5")), SomeModel(id=2)]
+
+        # Act
+        columns = converter.unstructure_columns([SomeLedgerDataclass(amount=Decimal("1.5"), fee=Decimal("0.1"))], SomeLedgerDataclass)
+        tortoise_columns = TortoiseConverter("tests.cattrs_extras.test_tortoise", fixed_scale_decimals=True).unstructure_columns(
+            models, SomeModel
+        )
+
+        # Assert
+        self.assertEqual(["1.50"], columns["amount"].tolist())
+        self.assertEqual(["0.10000000"], columns["fee"].tolist())
+        self.assertEqual(["1"], columns["rate"].tolist())
+        self.assertEqual(["1.5000000000", None], tortoise_columns["decimal"].tolist())
+
+    def test_unstructure_columns_empty(self):
+        # Act
+        columns = Converter().unstructure_columns([], SomeDataclass)
+
+        # Assert
+        self.assertEqual(0, len(columns["datetime_value"]))
+        self.assertEqual(0, len(columns["enum_value"].codes))
+
+    def test_unstructure_columns_tortoise(self):
+        # Arrange
+        converter = TortoiseConverter("tests.cattrs_extras.test_tortoise")
+        models = [
+            SomeModel(id=1, string="a", decimal=Decimal("1.5"), reversed_enum=SomeReversedEnum.K2, bool=True),
+            SomeModel(id=2, datetime=datetime(2020, 1, 2)),
+        ]
+
+        # Act
+        columns = converter.unstructure_columns(models, SomeModel)
+
+        # Assert
+        self.assertNotIn("relation", columns)
+        self.assertEqual("int64", columns["id"].dtype)
+        self.assertEqual(["a", None], columns["string"].tolist())
+        self.assertEqual(["K2"], columns["reversed_enum"].categories)
+        self.assertEqual([0, -1], columns["reversed_enum"].codes.tolist())
+        self.assertEqual([True, None], columns["bool"].tolist())
+        self.assertEqual("datetime64[us]", columns["datetime"].dtype)
+        models[0].enum = "V3"
+        with self.assertRaises(ValueError) as ctx:
+            converter.unstructure_columns(models, SomeModel)
+        self.assertEqual("'V3' is not a member of SomeEnum", str(ctx.exception))
+
+    def test_structure_columns(self):
+        # Arrange
+        converter = Converter()
+        objs = make_objs()
+
+        # Act
+        result = converter.structure_columns(converter.unstructure_columns(objs, SomeDataclass), SomeDataclass)
+
+        # Assert
+        self.assertEqual(objs, result)
+        self.assertEqual(timezone.utc, result[0].datetime_value.tzinfo)
+        self.assertIsNot(result[0].list_value, objs[0].list_value)
+
+    @unittest.skipIf(pyarrow is None, "pyarrow is not installed")
+    def test_structure_columns_arrow(self):
+        # Arrange
+        converter = Converter()
+        objs = make_objs()
+        columns = converter.unstructure_columns(objs, SomeDataclass)
+        batch = pyarrow.record_batch(
+            {
+                "int_value": columns["int_value"],
+                "optional_int_value": pyarrow.array([1, None]),
+                "float_value": pyarrow.array([1.5, None]),
+                "datetime_value": columns["datetime_value"],
+                "date_value": columns["date_value"],
+                "timedelta_value": columns["timedelta_value"],
+                "enum_value": pyarrow.array(["V1", None]).dictionary_encode(),
+                "decimal_value": pyarrow.array(["1.5", None]),
+                "list_value": pyarrow.array([["a"], ["b"]]),
+            }
+        )
+
+        # Act
+        with patch.object(DatetimeParser, "__call__") as parse_datetime:
+            result = converter.structure_columns(batch, SomeDataclass)
+            table_result = converter.structure_columns(pyarrow.Table.from_batches([batch]), SomeDataclass)
+
+        # Assert
+        parse_datetime.assert_not_called()
+        self.assertEqual(objs, result)
+        self.assertEqual(objs, table_result)
+        self.assertEqual(timezone.utc, result[0].datetime_value.tzinfo)
+
+    def test_structure_columns_plain(self):
+        # Arrange
+        converter = Converter()
+        columns = {
+            "int_value": [1, 2],
+            "optional_int_value": [None, 2],
+            "float_value": numpy.array([1.5, 2.5]),
+            "datetime_value": numpy.array([1577923445, 1577923446]),
+            "date_value": ["2020-01-02", "2020-01-03"],
+            "timedelta_value": ["1h", 90],
+            "enum_value": ["V1", "V1"],
+            "decimal_value": numpy.array(["1.5", "2.50"]),
+            "list_value": [["a"], []],
+        }
+
+        # Act
+        result = converter.structure_columns(columns, SomeDataclass)
+
+        # Assert
+        self.assertEqual(datetime(2020, 1, 2, 0, 4, 5, tzinfo=timezone.utc), result[0].datetime_value)
+        self.assertEqual(date(2020, 1, 3), result[1].date_value)
+        self.assertEqual([timedelta(hours=1), timedelta(seconds=90)], [e.timedelta_value for e in result])
+        self.assertIs(SomeEnum.K1, result[1].enum_value)
+        self.assertEqual("2.50", str(result[1].decimal_value))
+        self.assertEqual(2.5, result[1].float_value)
+
+    def test_structure_columns_invalid(self):
+        # Arrange
+        converter = Converter()
+        columns = converter.unstructure_columns(make_objs(), SomeDataclass)
+
+        # Act, Assert
+        with self.assertRaises(StructureError) as ctx:
+            converter.structure_columns({**columns, "enum_value": ["V1", "V3"]}, SomeDataclass)
+        self.assertEqual("Cannot structure SomeDataclass: invalid 'enum_value' column: 'V3' is not a valid SomeEnum", str(ctx.exception))
+        with self.assertRaises(StructureError) as ctx:
+            converter.structure_columns({"int_value": [1]}, SomeDataclass)
+        self.assertEqual("Cannot structure SomeDataclass: missing required column 'optional_int_value'", str(ctx.exception))
+        with self.assertRaises(StructureError) as ctx:
+            converter.structure_columns({**columns, "int_value": [1]}, SomeDataclass)
+        self.assertEqual("Cannot structure SomeDataclass: columns have different lengths", str(ctx.exception))
+
+    def test_structure_columns_tortoise(self):
+        # Arrange
+        converter = TortoiseConverter("tests.cattrs_extras.test_tortoise")
+        columns = {
+            "id": numpy.array([1, 2]),
+            "decimal": numpy.array(["1.23", "2"]),
+            "reversed_enum": Categorical(numpy.array([0, -1], dtype=numpy.int32), ["K2"]),
+            "datetime": numpy.array(["2020-01-02T03:04:05", "NaT"], dtype="datetime64[us]"),
+        }
+
+        # Act
+        result = converter.structure_columns(columns, SomeModel)
+
+        # Assert
+        self.assertEqual([1, 2], [e.id for e in result])
+        self.assertEqual([Decimal("1.23"), Decimal("2")], [e.decimal for e in result])
+        self.assertEqual([SomeReversedEnum.K2, None], [e.reversed_enum for e in result])
+        self.assertEqual([SomeModel(datetime=datetime(2020, 1, 2, 3, 4, 5)).datetime, None], [e.datetime for e in result])
+        self.assertTrue(result[0]._saved_in_db)
+        with self.assertRaises(StructureError) as ctx:
+            converter.structure_columns({"id": [1]}, SomeRequiredModel)
+        self.assertEqual("Cannot structure SomeRequiredModel: missing required column 'string'", str(ctx.exception))
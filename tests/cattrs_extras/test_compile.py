@@ -0,0 +1,70 @@
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stderr
+from io import StringIO
+from unittest.mock import patch
+
+from cattrs_extras.compile import _import_path
+from cattrs_extras.compile import main
+from cattrs_extras.converter import Converter
+from cattrs_extras.tortoise.converter import TortoiseConverter
+from tests.cattrs_extras.test_converter import SomeDataclass
+from tests.cattrs_extras.test_tortoise_db import Book
+
+
+class CompileTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, "compiled.py")
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def compile(self, *args: str) -> int:
+        with redirect_stderr(StringIO()):
+            return main([*args, "-o", self.path])
+
+    def test_compile(self):
+        # Arrange
+        data = {"int_value": 1, "attrs_value": {"int_value": 2}}
+        self.assertEqual(0, self.compile("tests.cattrs_extras.test_converter"))
+        converter = Converter()
+
+        # Act
+        converter.load_compiled(_import_path(self.path))
+        with patch("cattrs_extras.converter._compile_function") as compile_function:
+            result = converter.structure(data, SomeDataclass)
+
+        # Assert
+        compile_function.assert_not_called()
+        self.assertEqual(Converter().structure(data, SomeDataclass), result)
+
+    def test_compile_outdated(self):
+        # Arrange
+        self.assertEqual(0, self.compile("tests.cattrs_extras.test_converter"))
+        converter = Converter(collect_errors=True)
+
+        # Act
+        converter.load_compiled(_import_path(self.path))
+        with patch("cattrs_extras.converter._compile_function", wraps=lambda *args: None) as compile_function:
+            converter._structure_func.dispatch(SomeDataclass)
+
+        # Assert
+        self.assertEqual(1, compile_function.call_count)
+
+    def test_compile_tortoise(self):
+        # Arrange
+        data = {"id": 1, "title": "book", "price": "1.5", "author_id": 1}
+        self.assertEqual(0, self.compile("tests.cattrs_extras.test_tortoise_db"))
+        converter = TortoiseConverter("tests.cattrs_extras.test_tortoise_db")
+
+        # Act
+        converter.load_compiled(_import_path(self.path))
+        with patch("cattrs_extras.converter._compile_function") as compile_function:
+            result = converter.structure(data, Book)
+            unstructured = converter.unstructure(result)
+
+        # Assert
+        compile_function.assert_not_called()
+        self.assertEqual(data, unstructured)
@@ -1,16 +1,37 @@
+import inspect
+import io
 import unittest
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from datetime import datetime
+from datetime import timedelta
+from datetime import timezone
+from decimal import ROUND_DOWN
+from decimal import Context
 from decimal import Decimal
 from enum import Enum
 from typing import Dict
+from typing import Iterator
 from typing import List
 from typing import Optional
 from typing import Union
+from unittest.mock import patch
 
+from attr import attrib
 from attr import dataclass
+from attr import make_class
 
+from cattrs_extras.cache import CacheStats
+from cattrs_extras.converter import BatchStructureError
 from cattrs_extras.converter import Converter
+from cattrs_extras.converter import FieldError
 from cattrs_extras.converter import ReversedEnum
 from cattrs_extras.converter import StructureError
+from cattrs_extras.converter import ValidationError
+from cattrs_extras.parsers import DatetimeParser
+from cattrs_extras.parsers import _parse_datetime_epoch
+from cattrs_extras.parsers import _parse_datetime_isoformat
 
 
 class SomeEnum(Enum):
@@ -41,6 +62,22 @@ class SomeDataclass:
     attrs_value: Optional[SomeNestedDataclass] = None
 
 
+@dataclass(kw_only=True)
+class SomeLedgerDataclass:
+    amount: Decimal = attrib(metadata={"decimal_places": 2, "max_digits": 6})
+    fee: Optional[Decimal] = attrib(default=None, metadata={"decimal_places": 8})
+    rate: Decimal = Decimal("1")
+
+
+@dataclass(kw_only=True)
+class SomeEnumDataclass:
+    enum_value: SomeEnum
+
+
+def structure_enum_by_name(obj, cls):
+    return cls[obj]
+
+
 class ConverterTest(unittest.TestCase):
     def setUp(self) -> None:
         self.converter = Converter()
@@ -246,3 +283,385 @@ class ConverterTest(unittest.TestCase):
             )
         else:
             raise AssertionError
+
+    def test_learn_datetime_formats(self):
+        # Arrange
+        @dataclass(kw_only=True)
+        class SomeClass:
+            created: datetime
+            updated: Optional[datetime] = None
+            due: Optional[date] = None
+
+        converter = Converter(learn_datetime_formats=True)
+
+        # Act
+        result = converter.structure({"created": "2020-01-02T00:00:00", "updated": 1577923200}, SomeClass)
+        empty_result = converter.structure({"created": "2020-01-02T00:00:00", "updated": None, "due": None}, SomeClass)
+
+        # Assert
+        self.assertEqual(SomeClass(created=datetime(2020, 1, 2), updated=datetime(2020, 1, 2, tzinfo=timezone.utc)), result)
+        self.assertEqual(SomeClass(created=datetime(2020, 1, 2)), empty_result)
+        structure_fn = converter._structure_func.dispatch(SomeClass)
+        created_parser, updated_parser = (inspect.unwrap(structure_fn.__globals__[f"h_{i}"]) for i in range(2))
+        self.assertIsInstance(created_parser, DatetimeParser)
+        self.assertIsNot(created_parser, updated_parser)
+        self.assertIs(_parse_datetime_isoformat, created_parser.last_tier)
+        self.assertIs(_parse_datetime_epoch, updated_parser.last_tier)
+
+    def test_learn_datetime_formats_wrapped(self):
+        # Arrange
+        @dataclass(kw_only=True)
+        class SomeClass:
+            created: datetime
+
+        converter = Converter(learn_datetime_formats=True, scalar_cache_size=10, instrument=True)
+        data = [{"created": "2020-01-02T00:00:00"}] * 2
+
+        # Act
+        result = converter.structure(data, List[SomeClass])
+
+        # Assert
+        self.assertIs(result[0].created, result[1].created)
+        self.assertEqual(CacheStats(hits=1, misses=1, size=1), converter.scalar_cache_stats())
+        self.assertEqual(2, converter.hook_stats()["structure", datetime].calls)
+        structure_fn = inspect.unwrap(converter._structure_func.dispatch(SomeClass))
+        field_parser = inspect.unwrap(structure_fn.__globals__["h_0"])
+        self.assertIsNot(converter._datetime_parser, field_parser)
+        self.assertIs(_parse_datetime_isoformat, field_parser.last_tier)
+
+    def test_structure_many(self):
+        # Arrange
+        data = [{"int_value": 1}, {"int_value": 2}]
+
+        # Act
+        result = self.converter.structure_many(data, SomeNestedDataclass)
+
+        # Assert
+        self.assertEqual([SomeNestedDataclass(int_value=1), SomeNestedDataclass(int_value=2)], result)
+
+    def test_structure_many_errors(self):
+        # Arrange
+        data = [{"int_value": "not_an_int"}, {"int_value": 1}, {}]
+
+        # Act
+        with self.assertRaises(BatchStructureError) as ctx:
+            self.converter.structure_many(data, SomeNestedDataclass)
+
+        # Assert
+        self.assertEqual([0, 2], list(ctx.exception.errors))
+        self.assertEqual(
+            "Cannot structure 2 items of SomeNestedDataclass:\n"
+            "  [0] Cannot structure SomeNestedDataclass: not_an_int is not an instance of <class 'int'>\n"
+            "  [2] Cannot structure SomeNestedDataclass: missing 1 required keyword-only argument: 'int_value'",
+            str(ctx.exception),
+        )
+
+    def test_unstructure_many(self):
+        # Arrange
+        data = [SomeNestedDataclass(int_value=1), SomeReversedEnum.K1, Decimal("1.5")]
+
+        # Act
+        result = self.converter.unstructure_many(data)
+
+        # Assert
+        self.assertEqual([{"int_value": 1}, "K1", "1.5"], result)
+
+    def test_iter_structure(self):
+        # Arrange
+        fp = io.StringIO('{"int_value": 1}\n\n{"int_value": 2}\n')
+
+        # Act
+        result = self.converter.iter_structure(fp, SomeNestedDataclass)
+
+        # Assert
+        self.assertIsInstance(result, Iterator)
+        self.assertEqual([SomeNestedDataclass(int_value=1), SomeNestedDataclass(int_value=2)], list(result))
+
+    def test_iter_structure_error(self):
+        # Arrange
+        fp = io.BytesIO(b'{"int_value": 1}\n{"int_value": "not_an_int"}\n')
+
+        # Act
+        result = self.converter.iter_structure(fp, SomeNestedDataclass)
+
+        # Assert
+        self.assertEqual(SomeNestedDataclass(int_value=1), next(result))
+        with self.assertRaises(StructureError) as ctx:
+            next(result)
+        self.assertEqual(
+            "Cannot structure line 2: Cannot structure SomeNestedDataclass: not_an_int is not an instance of <class 'int'>",
+            str(ctx.exception),
+        )
+
+    def test_iter_unstructure_to(self):
+        # Arrange
+        text_fp, binary_fp = io.StringIO(), io.BytesIO()
+        objs = [SomeDataclass(decimal_value=Decimal("1.5")), SomeDataclass(list_value=["a"])]
+
+        # Act
+        text_written = self.converter.iter_unstructure_to(text_fp, iter(objs))
+        binary_written = self.converter.iter_unstructure_to(binary_fp, iter(objs))
+
+        # Assert
+        self.assertEqual((2, 2), (text_written, binary_written))
+        self.assertEqual(text_fp.getvalue().encode(), binary_fp.getvalue())
+        self.assertEqual(objs, list(self.converter.iter_structure(io.StringIO(text_fp.getvalue()), SomeDataclass)))
+
+    def test_union_many_members(self):
+        # Arrange
+        classes = [make_class(f"Event{i}", {"kind": attrib(type=str), f"field_{i}": attrib(type=int)}, kw_only=True) for i in range(20)]
+        union = Union[tuple(classes)]  # type: ignore
+
+        # Act
+        result = self.converter.structure([{"kind": "", f"field_{i}": i} for i in range(20)], List[union])  # type: ignore
+
+        # Assert
+        self.assertEqual(classes, [e.__class__ for e in result])
+
+    def test_instrumentation(self):
+        # Arrange
+        converter = Converter(instrument=True)
+        calls = []
+
+        # Act
+        converter.structure({"int_value": 1}, SomeNestedDataclass)
+        with self.assertRaises(StructureError):
+            converter.structure({"int_value": "not_an_int"}, SomeNestedDataclass)
+        converter.unstructure(Decimal("1.5"))
+        stats = converter.hook_stats(reset=True)
+        with converter.instrumented(lambda *args: calls.append(args)):
+            converter.structure("1.5", Decimal)
+
+        # Assert
+        self.assertEqual(
+            {("structure", SomeNestedDataclass), ("structure", int), ("unstructure", Decimal)},
+            set(stats),
+        )
+        self.assertEqual((2, 1), (stats["structure", SomeNestedDataclass].calls, stats["structure", SomeNestedDataclass].failures))
+        self.assertEqual((2, 1), (stats["structure", int].calls, stats["structure", int].failures))
+        self.assertEqual("Converter._unstructure_decimal", stats["unstructure", Decimal].hook)
+        self.assertGreater(stats["structure", SomeNestedDataclass].total_time, stats["structure", int].total_time)
+        self.assertEqual([("structure", Decimal, False)], [(kind, cl, failed) for kind, cl, _, failed in calls])
+        self.assertEqual({}, converter.hook_stats())
+
+    def test_instrumentation_disabled(self):
+        # Act
+        with self.converter.instrumented():
+            self.converter.structure({"int_value": 1}, SomeNestedDataclass)
+
+        # Assert
+        self.assertFalse(hasattr(self.converter._structure_func.dispatch(SomeNestedDataclass), "__wrapped__"))
+        with self.assertRaises(RuntimeError):
+            self.converter.hook_stats()
+
+    def test_structure_missing_arguments_message(self):
+        # Arrange
+        @dataclass
+        class SomeClass:
+            a: int
+            b: int
+            c: int
+            d: int = attrib(kw_only=True)
+
+        # Act
+        with self.assertRaises(StructureError) as ctx:
+            self.converter.structure({"b": 1}, SomeClass)
+
+        # Assert
+        self.assertEqual(
+            f"Cannot structure {SomeClass.__qualname__}: missing 2 required positional arguments: 'a' and 'c'", str(ctx.exception)
+        )
+
+    def test_structure_attrs_fromdict_cached(self):
+        # Arrange
+        converter = Converter()
+        expected = converter.structure_attrs_fromdict({"int_value": "1"}, SomeNestedDataclass)
+
+        # Act
+        with patch.object(converter, "_gen_structure_attrs", wraps=converter._gen_structure_attrs) as gen_structure_attrs:
+            result = converter.structure_attrs_fromdict({"int_value": "1"}, SomeNestedDataclass)
+
+        # Assert
+        self.assertEqual(expected, result)
+        gen_structure_attrs.assert_not_called()
+
+    def test_structure_attrs_fromdict_delegation(self):
+        # Arrange
+        converter = Converter()
+        converter.register_structure_hook(
+            SomeNestedDataclass, lambda obj, cl: converter.structure_attrs_fromdict({"int_value": obj["value"]}, cl)
+        )
+
+        # Act
+        result = converter.structure({"value": "1"}, SomeNestedDataclass)
+
+        # Assert
+        self.assertEqual(SomeNestedDataclass(int_value=1), result)
+
+    def test_collect_errors(self):
+        # Arrange
+        @dataclass(kw_only=True)
+        class SomeItem:
+            price: Decimal
+            quantity: int
+
+        @dataclass(kw_only=True)
+        class SomeOrder:
+            items: List[SomeItem]
+            comment: Optional[str] = None
+
+        @dataclass(kw_only=True)
+        class SomeCart:
+            orders: List[SomeOrder]
+            owner: SomeNestedDataclass
+
+        converter = Converter(collect_errors=True)
+        valid_order = {"items": [{"price": "1.5", "quantity": 1}]}
+        data = {
+            "orders": [valid_order, valid_order, valid_order, {"items": [{"price": "not_a_decimal", "quantity": 1}, {}]}],
+            "owner": "not_an_attrs",
+        }
+
+        # Act
+        with self.assertRaises(ValidationError) as ctx:
+            converter.structure(data, SomeCart)
+
+        # Assert
+        self.assertEqual(
+            [
+                FieldError("orders[3].items[0].price", "not_a_decimal is not an instance of <class 'decimal.Decimal'>"),
+                FieldError("orders[3].items[1].price", "missing required field"),
+                FieldError("orders[3].items[1].quantity", "missing required field"),
+                FieldError(
+                    "owner",
+                    "not_an_attrs is not an instance of <class 'tests.cattrs_extras.test_converter.SomeNestedDataclass'>",
+                ),
+            ],
+            ctx.exception.errors,
+        )
+        self.assertTrue(
+            str(ctx.exception).startswith(f"Cannot structure {SomeCart.__qualname__}: 4 invalid fields\n  orders[3].items[0].price: ")
+        )
+
+    def test_structure_many_executor(self):
+        # Arrange
+        converter = Converter(collect_errors=True)
+        converter.register_structure_hook(SomeEnum, structure_enum_by_name)
+        data = [{"enum_value": "K1"}, {"enum_value": "K2"}, {"enum_value": "V1"}, {"enum_value": "K2"}, {}]
+
+        for executor_cls in (ProcessPoolExecutor, ThreadPoolExecutor):
+            with self.subTest(executor_cls=executor_cls), executor_cls(max_workers=2) as executor:
+                # Act
+                with self.assertRaises(BatchStructureError) as ctx:
+                    converter.structure_many(data, SomeEnumDataclass, executor=executor, chunk_size=2)
+                result = converter.structure_many(data[:2] * 3, SomeEnumDataclass, executor=executor, chunk_size=2)
+
+                # Assert
+                self.assertEqual([SomeEnum.K1, SomeEnum.K2] * 3, [item.enum_value for item in result])
+                self.assertEqual([2, 4], list(ctx.exception.errors))
+                self.assertEqual(
+                    [FieldError("enum_value", "V1 is not an instance of <enum 'SomeEnum'>")],
+                    ctx.exception.errors[2].errors,
+                )
+
+    def test_freeze(self):
+        # Arrange
+        data = {"int_value": 1, "list_value": ["a"], "attrs_value": {"int_value": 2}}
+
+        # Act
+        self.converter.freeze(SomeDataclass)
+        result = self.converter.structure(data, SomeDataclass)
+        table = self.converter._structure_func.dispatch.__self__
+
+        # Assert
+        self.assertEqual(Converter().structure(data, SomeDataclass), result)
+        self.assertEqual({"int_value": 2}, self.converter.unstructure(result.attrs_value))
+        self.assertTrue({SomeDataclass, SomeNestedDataclass, Optional[SomeNestedDataclass], List[str], str, Decimal} <= set(table))
+        self.assertNotIn(Dict[int, int], table)
+        self.assertEqual({1: 2}, self.converter.structure({"1": "2"}, Dict[int, int]))
+        self.assertIn(Dict[int, int], table)
+        with self.assertRaises(RuntimeError):
+            self.converter.register_structure_hook(SomeEnum, structure_enum_by_name)
+
+    def test_structure_decimal(self):
+        # Arrange
+        subtest_params = ["1.50", 1, 1.5, Decimal("1.50")]
+
+        for value in subtest_params:
+            with self.subTest(value=value):
+                # Act
+                result = self.converter.structure({"decimal_value": value}, SomeDataclass)
+
+                # Assert
+                self.assertIs(Decimal, result.decimal_value.__class__)
+                self.assertEqual(Decimal(str(value)), result.decimal_value)
+
+    def test_decimal_quantization(self):
+        # Arrange
+        converter = Converter(decimal_context=Context(rounding=ROUND_DOWN), fixed_scale_decimals=True)
+
+        # Act
+        result = converter.structure({"amount": "1.239", "fee": 0.0000001, "rate": "1.239"}, SomeLedgerDataclass)
+        json = converter.unstructure(SomeLedgerDataclass(amount=Decimal("2.5"), rate=Decimal("2.5")))
+
+        # Assert
+        self.assertEqual("1.23", str(result.amount))
+        self.assertEqual("1.0E-7", str(result.fee))
+        self.assertEqual("1.239", str(result.rate))
+        self.assertEqual({"amount": "2.50", "fee": None, "rate": "2.5"}, json)
+        self.assertEqual("0.00000010", converter.unstructure(result)["fee"])
+        with self.assertRaises(StructureError) as ctx:
+            converter.structure({"amount": "12345.6"}, SomeLedgerDataclass)
+        self.assertEqual("Cannot structure Decimal: 12345.6 doesn't fit into 6 digits with 2 decimal places", str(ctx.exception))
+
+    def test_scalar_cache(self):
+        # Arrange
+        converter = Converter(scalar_cache_size=2)
+        data = [{"decimal_value": "1.5", "enum_value": "V1", "list_value": ["a"]}] * 3
+
+        # Act
+        result = converter.structure(data, List[SomeDataclass])
+        converter.structure(1, Decimal)
+        stats = converter.scalar_cache_stats(reset=True)
+        converter.structure(2, Decimal)
+
+        # Assert
+        self.assertEqual(self.converter.structure(data, List[SomeDataclass]), result)
+        self.assertIs(result[0].decimal_value, result[2].decimal_value)
+        self.assertIsNot(result[0].list_value, result[2].list_value)
+        self.assertEqual(CacheStats(hits=4, misses=3, evictions=1, size=2), stats)
+        self.assertEqual(CacheStats(misses=1, evictions=1, size=2), converter.scalar_cache_stats())
+        with self.assertRaises(RuntimeError):
+            self.converter.scalar_cache_stats()
+
+    def test_scalar_cache_equal_values(self):
+        # Arrange
+        converter = Converter(scalar_cache_size=10)
+        aware = datetime(2020, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+
+        # Act
+        decimals = [converter.structure(value, Decimal) for value in (Decimal("1.0"), Decimal("1.00"))]
+        zeros = [converter.structure(value, Decimal) for value in (-0.0, 0.0)]
+        datetimes = [converter.structure(value, datetime) for value in (aware.astimezone(timezone(timedelta(hours=3))), aware)]
+
+        # Assert
+        self.assertEqual(["1.0", "1.00"], [str(value) for value in decimals])
+        self.assertEqual(["-0.0", "0.0"], [str(value) for value in zeros])
+        self.assertEqual([timedelta(hours=3), timedelta()], [value.utcoffset() for value in datetimes])
+        self.assertEqual(CacheStats(), converter.scalar_cache_stats())
+
+    def test_scalar_cache_ttl(self):
+        # Arrange
+        with patch("cattrs_extras.cache.time.monotonic", side_effect=[0.0, 5.0, 11.0, 11.0]):
+            converter = Converter(scalar_cache_size=10, scalar_cache_ttl=10.0)
+
+            # Act
+            first = converter.structure("2020-01-02T03:04:05", datetime)
+            second = converter.structure("2020-01-02T03:04:05", datetime)
+            third = converter.structure("2020-01-02T03:04:05", datetime)
+
+        # Assert
+        self.assertIs(first, second)
+        self.assertIsNot(first, third)
+        self.assertEqual(first, third)
+        self.assertEqual(CacheStats(hits=1, misses=2, expirations=1, size=1), converter.scalar_cache_stats())
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import unittest
+from decimal import Decimal
+from typing import List
+from typing import Optional
+from typing import Union
+
+from attr import dataclass
+from attr import fields
+
+from cattrs_extras.converter import Converter
+from cattrs_extras.converter import StructureError
+
+
+@dataclass(kw_only=True)
+class SomeNestedDataclass:
+    decimal_value: Decimal
+
+
+@dataclass(kw_only=True)
+class SomeOtherNestedDataclass:
+    int_value: int
+
+
+@dataclass(kw_only=True)
+class SomeDataclass:
+    nested_value: SomeNestedDataclass
+    optional_value: Optional[SomeNestedDataclass] = None
+    list_value: List[SomeNestedDataclass] = []
+    union_value: Union[SomeNestedDataclass, SomeOtherNestedDataclass, None] = None
+    parent: Optional["SomeDataclass"] = None
+
+
+@dataclass(kw_only=True)
+class SomeUnresolvableDataclass:
+    value: SomeMissingDataclass  # type: ignore  # noqa: F821
+
+
+class ConverterPEP563Test(unittest.TestCase):
+    def setUp(self) -> None:
+        self.converter = Converter()
+
+    def test_structure(self):
+        # Arrange
+        data = {
+            "nested_value": {"decimal_value": "1.5"},
+            "optional_value": {"decimal_value": "2.5"},
+            "list_value": [{"decimal_value": "3.5"}],
+            "union_value": {"int_value": 4},
+            "parent": {"nested_value": {"decimal_value": "5.5"}},
+        }
+
+        # Act
+        result = self.converter.structure(data, SomeDataclass)
+
+        # Assert
+        self.assertEqual(
+            SomeDataclass(
+                nested_value=SomeNestedDataclass(decimal_value=Decimal("1.5")),
+                optional_value=SomeNestedDataclass(decimal_value=Decimal("2.5")),
+                list_value=[SomeNestedDataclass(decimal_value=Decimal("3.5"))],
+                union_value=SomeOtherNestedDataclass(int_value=4),
+                parent=SomeDataclass(nested_value=SomeNestedDataclass(decimal_value=Decimal("5.5"))),
+            ),
+            result,
+        )
+
+    def test_unstructure(self):
+        # Arrange
+        obj = SomeDataclass(nested_value=SomeNestedDataclass(decimal_value=Decimal("1.5")))
+
+        # Act
+        result = self.converter.unstructure(obj)
+
+        # Assert
+        self.assertEqual(
+            {"nested_value": {"decimal_value": "1.5"}, "optional_value": None, "list_value": [], "union_value": None, "parent": None},
+            result,
+        )
+
+    def test_resolved_once_without_mutation(self):
+        # Act
+        self.converter.structure({"nested_value": {"decimal_value": "1.5"}}, SomeDataclass)
+        resolved_fields = self.converter._attrs_fields[SomeDataclass]
+        self.converter.structure({"nested_value": {"decimal_value": "1.5"}}, SomeDataclass)
+
+        # Assert
+        self.assertIs(resolved_fields, self.converter._get_attrs_fields(SomeDataclass))
+        self.assertIs(SomeNestedDataclass, resolved_fields[0].type)
+        self.assertEqual("SomeNestedDataclass", fields(SomeDataclass)[0].type)
+
+    def test_unresolvable(self):
+        # Act, Assert
+        with self.assertRaises(StructureError) as ctx:
+            self.converter.structure({"value": {}}, SomeUnresolvableDataclass)
+        self.assertEqual(
+            "Cannot structure SomeUnresolvableDataclass: failed to resolve type annotations: name 'SomeMissingDataclass' is not defined",
+            str(ctx.exception),
+        )
@@ -0,0 +1,100 @@
+import unittest
+from datetime import datetime
+from decimal import Decimal
+from typing import List
+from typing import Optional
+
+from attr import Factory
+from attr import dataclass
+
+from cattrs_extras.converter import Converter
+from cattrs_extras.converter import StructureError
+from cattrs_extras.lazy import LazyList
+from cattrs_extras.lazy import LazyProxy
+from cattrs_extras.lazy import materialize
+from tests.cattrs_extras.test_converter import SomeLedgerDataclass
+
+
+@dataclass(kw_only=True)
+class SomeItem:
+    price: Decimal
+    created: datetime
+
+
+@dataclass(kw_only=True)
+class SomeOrder:
+    items: List[SomeItem]
+    parent: Optional["SomeOrder"] = None
+    tags: List[str] = Factory(list)
+
+
+class LazyTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.converter = Converter()
+        self.data = {
+            "items": [{"price": "1.5", "created": "2020-01-02T00:00:00"}, {"price": "not_a_decimal", "created": 0}],
+            "parent": {"items": []},
+        }
+
+    def test_structure_lazy(self):
+        # Arrange
+        converter = Converter(instrument=True)
+        proxy = converter.structure_lazy(self.data, SomeOrder)
+
+        # Act
+        price = proxy.items[0].price
+        price_again = proxy.items[0].price
+        stats = converter.hook_stats()
+
+        # Assert
+        self.assertIsInstance(proxy, LazyProxy)
+        self.assertIsInstance(proxy.items, LazyList)
+        self.assertIsInstance(proxy.parent, LazyProxy)
+        self.assertEqual(Decimal("1.5"), price)
+        self.assertIs(price, price_again)
+        self.assertEqual({("structure", Decimal)}, set(stats))
+        self.assertEqual(1, stats["structure", Decimal].calls)
+        self.assertEqual([], proxy.tags)
+        self.assertEqual(datetime(2020, 1, 2), proxy.items[:1][0].created)
+        self.assertEqual(2, len(proxy.items))
+
+    def test_structure_lazy_errors(self):
+        # Arrange
+        proxy = self.converter.structure_lazy(self.data, SomeOrder)
+
+        # Act, Assert
+        with self.assertRaises(StructureError) as ctx:
+            proxy.items[1].price
+        self.assertEqual("Cannot structure SomeItem: not_a_decimal is not an instance of <class 'decimal.Decimal'>", str(ctx.exception))
+
+        with self.assertRaises(StructureError) as ctx:
+            self.converter.structure_lazy({}, SomeOrder).items
+        self.assertEqual("Cannot structure SomeOrder: missing required field 'items'", str(ctx.exception))
+
+        with self.assertRaises(AttributeError):
+            proxy.missing_attribute
+
+    def test_materialize(self):
+        # Arrange
+        self.data["items"].pop()
+        proxy = self.converter.structure_lazy(self.data, SomeOrder)
+
+        # Act
+        result = materialize(proxy)
+
+        # Assert
+        self.assertEqual(self.converter.structure(self.data, SomeOrder), result)
+        self.assertEqual(result, proxy)
+        self.assertEqual(self.converter.unstructure(result), self.converter.unstructure(proxy))
+
+    def test_structure_lazy_quantization(self):
+        # Arrange
+        proxy = self.converter.structure_lazy({"amount": "1.239", "fee": "0.5"}, SomeLedgerDataclass)
+
+        # Act
+        amount, fee = proxy.amount, proxy.fee
+
+        # Assert
+        self.assertEqual("1.24", str(amount))
+        self.assertEqual("0.50000000", str(fee))
+        self.assertEqual(self.converter.structure({"amount": "1.239", "fee": "0.5"}, SomeLedgerDataclass), materialize(proxy))
@@ -0,0 +1,155 @@
+import unittest
+from datetime import date
+from datetime import datetime
+from datetime import timedelta
+from datetime import timezone
+
+from cattrs_extras.parsers import DateParser
+from cattrs_extras.parsers import DatetimeParser
+from cattrs_extras.parsers import TimedeltaParser
+from cattrs_extras.parsers import _parse_datetime_epoch
+from cattrs_extras.parsers import _parse_datetime_isoformat
+from cattrs_extras.parsers import _parse_duration
+
+
+class DatetimeParserTest(unittest.TestCase):
+    def test_parse_datetime(self):
+        # Arrange
+        parser = DatetimeParser()
+        subtest_params = [
+            [1577923445, datetime(2020, 1, 2, 0, 4, 5, tzinfo=timezone.utc)],
+            [1577923445.5, datetime(2020, 1, 2, 0, 4, 5, 500000, tzinfo=timezone.utc)],
+            ["1577923445.0", datetime(2020, 1, 2, 0, 4, 5, tzinfo=timezone.utc)],
+            ["2020-01-02", datetime(2020, 1, 2)],
+            ["2020-01-02T00:04:05", datetime(2020, 1, 2, 0, 4, 5)],
+            ["2020-01-02T00:04:05.123Z", datetime(2020, 1, 2, 0, 4, 5, 123000, tzinfo=timezone.utc)],
+            ["2020-01-02 00:04:05+03:00", datetime(2020, 1, 2, 0, 4, 5, tzinfo=timezone(timedelta(hours=3)))],
+            ["Jan 2 2020 00:04:05", datetime(2020, 1, 2, 0, 4, 5)],
+            [datetime(2020, 1, 2), datetime(2020, 1, 2)],
+        ]
+
+        for data, expected in subtest_params:
+            with self.subTest(data=data):
+                # Act
+                result = parser(data, datetime)
+
+                # Assert
+                self.assertEqual(expected, result)
+
+    def test_parse_datetime_invalid(self):
+        # Arrange
+        parser = DatetimeParser()
+
+        for data in ["not_a_datetime", "2020-13-45", None, [1]]:
+            with self.subTest(data=data):
+                # Act, Assert
+                with self.assertRaises(ValueError):
+                    parser(data, datetime)
+
+    def test_parse_date(self):
+        # Arrange
+        parser = DateParser()
+        subtest_params = [
+            ["2020-01-02", date(2020, 1, 2)],
+            ["2020-01-02T23:00:00-05:00", date(2020, 1, 2)],
+            ["Jan 2 2020", date(2020, 1, 2)],
+            [datetime(2020, 1, 2, 3, 4, 5), date(2020, 1, 2)],
+            [date(2020, 1, 2), date(2020, 1, 2)],
+        ]
+
+        for data, expected in subtest_params:
+            with self.subTest(data=data):
+                # Act
+                result = parser(data, date)
+
+                # Assert
+                self.assertEqual(expected, result)
+
+    def test_learn(self):
+        # Arrange
+        parser = DatetimeParser(learn=True)
+        field_parser = parser.copy()
+
+        # Act
+        parser("2020-01-02T00:04:05")
+        field_parser("Jan 2 2020")
+
+        # Assert
+        self.assertIs(_parse_datetime_isoformat, parser.last_tier)
+        self.assertIsNone(field_parser.last_tier)
+        self.assertEqual(datetime(2020, 1, 2, tzinfo=timezone.utc), parser(1577923200))
+        self.assertIs(_parse_datetime_epoch, parser.last_tier)
+
+    def test_learn_same_result(self):
+        # Arrange
+        parser = DatetimeParser(learn=True)
+        fresh_result = DatetimeParser()("20200101")
+
+        # Act
+        results = []
+        for value in ("20200101", "Jan 2 2020", "20200101", "2020-01-02T00:04:05", "20200101"):
+            results.append(parser(value))
+
+        # Assert
+        self.assertEqual(datetime(1970, 8, 22, 19, 8, 21, tzinfo=timezone.utc), fresh_result)
+        self.assertEqual([fresh_result] * 3, results[::2])
+        self.assertEqual(datetime(2020, 1, 2), results[1])
+        self.assertIs(_parse_datetime_epoch, parser.last_tier)
+
+    def test_no_learn(self):
+        # Arrange
+        parser = DatetimeParser()
+
+        # Act
+        parser("2020-01-02T00:04:05")
+
+        # Assert
+        self.assertIsNone(parser.last_tier)
+
+    def test_parse_timedelta(self):
+        # Arrange
+        parser = TimedeltaParser()
+        subtest_params = [
+            [90, timedelta(seconds=90)],
+            [1.5, timedelta(seconds=1.5)],
+            ["1.5", timedelta(seconds=1.5)],
+            ["PT1H30M", timedelta(hours=1, minutes=30)],
+            ["-P1DT0.5S", -timedelta(days=1, seconds=0.5)],
+            ["1h30m", timedelta(hours=1, minutes=30)],
+            ["1 hour, 30 minutes and 5 secs", timedelta(hours=1, minutes=30, seconds=5)],
+            ["1.5h 500ms", timedelta(hours=1.5, milliseconds=500)],
+            ["4:13", timedelta(minutes=4, seconds=13)],
+            ["1d 2:03:04.5", timedelta(days=1, hours=2, minutes=3, seconds=4.5)],
+            [timedelta(days=1), timedelta(days=1)],
+        ]
+
+        for data, expected in subtest_params:
+            with self.subTest(data=data):
+                # Act
+                result = parser(data, timedelta)
+
+                # Assert
+                self.assertEqual(expected, result)
+
+    def test_parse_timedelta_invalid(self):
+        # Arrange
+        parser = TimedeltaParser()
+
+        for data in ["not_a_timedelta", "P1Y", "PT", "1e400", None, [1]]:
+            with self.subTest(data=data):
+                # Act, Assert
+                with self.assertRaises(ValueError):
+                    parser(data, timedelta)
+
+    def test_parse_timedelta_cached(self):
+        # Arrange
+        parser = TimedeltaParser()
+        parser("PT42M")
+        hits = _parse_duration.cache_info().hits
+
+        # Act
+        result = parser("PT42M")
+
+        # Assert
+        self.assertEqual(timedelta(minutes=42), result)
+        self.assertEqual(hits + 1, _parse_duration.cache_info().hits)
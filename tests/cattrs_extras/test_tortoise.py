@@ -1,13 +1,20 @@
 from datetime import date
 from datetime import datetime
 from datetime import timedelta
+from datetime import timezone
 from decimal import Decimal
 from enum import Enum
+from typing import Optional
+from typing import Union
 from unittest import TestCase
 
+from attr import dataclass
+from tortoise import Tortoise
 from tortoise import fields  # type: ignore
 
 from cattrs_extras.converter import ReversedEnum
+from cattrs_extras.converter import StructureError
+from cattrs_extras.parsers import DatetimeParser
 from cattrs_extras.tortoise.converter import TortoiseConverter
 from cattrs_extras.tortoise.fields import ReversedCharEnumField
 from cattrs_extras.tortoise.model import Model
@@ -37,6 +44,15 @@ class SomeModel(Model):
         table = "test_models"
 
 
+class SomeRequiredModel(Model):
+    id = fields.IntField(pk=True)
+    string = fields.CharField(255)
+    datetime = fields.DatetimeField(auto_now_add=True)
+
+    class Meta:  # pylint: disable=too-few-public-methods)
+        table = "test_required_models"
+
+
 class TortoiseConverterTest(TestCase):
     def setUp(self) -> None:
         self.converter = TortoiseConverter("tests.cattrs_extras.test_tortoise")
@@ -108,6 +124,30 @@ class TortoiseConverterTest(TestCase):
             json,
         )
 
+    def test_tortoise_unstructure_memo(self):
+        # Arrange
+        model = SomeModel(id=1)
+        model._saved_in_db = True
+        related_model = SomeModel(id=2, relation=model)
+        related_model._saved_in_db = True
+        model.relation = related_model
+
+        # Act
+        ref_json = self.converter.unstructure([model, related_model], include={"id", "relation"}, memo="ref")
+        reuse_json = self.converter.unstructure([model, related_model], include={"id", "relation.id", "relation.relation"}, memo="reuse")
+
+        # Assert
+        self.assertEqual(2, ref_json[1])
+        self.assertEqual(1, ref_json[0]["relation"]["relation"])
+        self.assertEqual(
+            [{"id": 1, "relation": {"id": 2, "relation": 1}}, {"id": 2, "relation": {"id": 1, "relation": 2}}],
+            reuse_json,
+        )
+        with self.assertRaises(RecursionError):
+            self.converter.unstructure(model)
+        with self.assertRaises(ValueError):
+            self.converter.unstructure(model, memo="copy")
+
     def test_tortoise_structure(self):
         # Arrange
         json = {
@@ -265,3 +305,135 @@ class TortoiseConverterTest(TestCase):
             model.relation,
         )
         self.assertEqual(True, model._saved_in_db)
+
+    def test_tortoise_structure_not_nullable(self):
+        # Arrange
+        json = {"id": 1}
+
+        # Act, Assert
+        with self.assertRaises(StructureError) as ctx:
+            self.converter.structure(json, SomeRequiredModel)
+        self.assertEqual('Cannot structure SomeRequiredModel: "string" field is not nullable', str(ctx.exception))
+
+    def test_tortoise_structure_auto_now_add(self):
+        # Arrange
+        json = {"string": "test"}
+
+        # Act
+        model = self.converter.structure(json, SomeRequiredModel)
+
+        # Assert
+        self.assertEqual("test", model.string)
+        self.assertEqual(False, model._saved_in_db)
+
+    def test_tortoise_plan_cached(self):
+        # Act
+        structure_fn = self.converter._structure_func.dispatch(SomeModel)
+        unstructure_fn = self.converter._unstructure_func.dispatch(SomeModel)
+
+        # Assert
+        self.assertIs(structure_fn, self.converter._structure_func.dispatch(SomeModel))
+        self.assertIs(unstructure_fn, self.converter._unstructure_func.dispatch(SomeModel))
+        self.assertIsNot(structure_fn, self.converter._structure_func.dispatch(SomeRequiredModel))
+
+    def test_tortoise_learn_datetime_formats(self):
+        # Arrange
+        converter = TortoiseConverter("tests.cattrs_extras.test_tortoise", learn_datetime_formats=True)
+
+        # Act
+        model = converter.structure({"date": "2020-01-02", "datetime": 1577923445.0}, SomeModel)
+
+        # Assert
+        self.assertEqual(date(2020, 1, 2), model.date)
+        self.assertEqual(datetime(2020, 1, 2, 0, 4, 5, tzinfo=timezone.utc), model.datetime)
+        structure_fn = converter._structure_func.dispatch(SomeModel)
+        field_parsers = [v for k, v in structure_fn.__globals__.items() if k.startswith("h_") and isinstance(v, DatetimeParser)]
+        self.assertEqual(2, len(field_parsers))
+        self.assertNotIn(converter._datetime_parser, field_parsers)
+
+    def test_tortoise_structure_union(self):
+        # Arrange
+        union = Optional[Union[SomeModel, SomeRequiredModel]]
+
+        # Act
+        some_model = self.converter.structure({"id": 1, "string": "test", "bool": True}, union)
+        required_model = self.converter.structure({"id": 1, "string": "test"}, union)
+        none = self.converter.structure(None, union)
+
+        # Assert
+        self.assertIsInstance(some_model, SomeModel)
+        self.assertIsInstance(required_model, SomeRequiredModel)
+        self.assertIsNone(none)
+
+    def test_tortoise_structure_optional_model(self):
+        # Act
+        model = self.converter.structure({"id": 1, "string": "test"}, Optional[SomeModel])
+        none = self.converter.structure(None, Optional[SomeModel])
+
+        # Assert
+        self.assertIsInstance(model, SomeModel)
+        self.assertEqual("test", model.string)
+        self.assertIsNone(none)
+
+    def test_attrs_structure_union(self):
+        # Arrange
+        @dataclass(kw_only=True)
+        class SomeClass:
+            a: str
+
+        @dataclass(kw_only=True)
+        class AnotherClass:
+            b: str
+
+        # Act
+        result = self.converter.structure({"b": ""}, Union[SomeClass, AnotherClass])
+
+        # Assert
+        self.assertIsInstance(result, AnotherClass)
+
+    def test_tortoise_decimal_quantization(self):
+        # Arrange
+        converter = TortoiseConverter("tests.cattrs_extras.test_tortoise", fixed_scale_decimals=True)
+
+        # Act
+        model = converter.structure({"id": 1, "decimal": "1.230000000051"}, SomeModel)
+        json = converter.unstructure(SomeModel(id=2, decimal=Decimal("1.5")))
+
+        # Assert
+        self.assertEqual(Decimal("1.2300000001"), model.decimal)
+        self.assertEqual("1.5000000000", json["decimal"])
+        self.assertIsNone(converter.unstructure(SomeModel(id=3))["decimal"])
+        with self.assertRaises(StructureError):
+            converter.structure({"id": 1, "decimal": "12345678901"}, SomeModel)
+
+    def test_tortoise_model_registry(self):
+        # Arrange
+        converter = TortoiseConverter({"models": "tests.cattrs_extras.test_tortoise", "other": ["tests.cattrs_extras.test_tortoise_db"]})
+        relation_field = SomeModel._meta.fields_map["relation"]
+
+        # Act
+        model = converter.structure({"id": 1, "relation": {"id": 2}}, SomeModel)
+
+        # Assert
+        self.assertEqual(2, model.relation.id)
+        self.assertIs(SomeModel, converter._related_models[relation_field])
+        self.assertIs(SomeModel, converter._get_model_registry()["models.SomeModel"])
+        self.assertEqual("Book", converter._get_model_registry()["other.Book"].__name__)
+
+    def test_tortoise_model_registry_unresolved(self):
+        # Arrange
+        class SomeBrokenModel(Model):
+            id = fields.IntField(pk=True)
+            relation = fields.ForeignKeyField("models.SomeMissingModel", null=True)
+
+        # Act, Assert
+        with self.assertRaises(StructureError) as ctx:
+            self.converter.structure({"id": 1, "relation": {"id": 2}}, SomeBrokenModel)
+        self.assertEqual("Cannot resolve related model models.SomeMissingModel: not found or ambiguous", str(ctx.exception))
+
+        Tortoise.apps, apps = {}, Tortoise.apps
+        try:
+            with self.assertRaises(StructureError):
+                TortoiseConverter().structure({"id": 1, "relation": {"id": 2}}, SomeModel)
+        finally:
+            Tortoise.apps = apps
@@ -0,0 +1,329 @@
+import io
+import json
+from datetime import date
+from datetime import datetime
+from datetime import timedelta
+from decimal import Decimal
+from enum import Enum
+from unittest import IsolatedAsyncioTestCase
+from unittest.mock import patch
+
+from tortoise import Tortoise
+from tortoise import fields  # type: ignore
+
+from cattrs_extras.converter import BatchStructureError
+from cattrs_extras.converter import ReversedEnum
+from cattrs_extras.converter import StructureError
+from cattrs_extras.tortoise.converter import TortoiseConverter
+from cattrs_extras.tortoise.fields import ReversedCharEnumField
+from cattrs_extras.tortoise.model import Model
+
+
+class Author(Model):
+    id = fields.IntField(pk=True)
+    name = fields.CharField(255)
+
+    class Meta:  # pylint: disable=too-few-public-methods)
+        table = "test_authors"
+
+
+class Book(Model):
+    id = fields.IntField(pk=True)
+    title = fields.CharField(255)
+    price = fields.DecimalField(20, 2, null=True)
+    author = fields.ForeignKeyField("models.Author", related_name="books")
+
+    class Meta:  # pylint: disable=too-few-public-methods)
+        table = "test_books"
+
+
+class Review(Model):
+    id = fields.IntField(pk=True)
+    rating = fields.IntField()
+    book = fields.ForeignKeyField("models.Book", related_name="reviews")
+
+    class Meta:  # pylint: disable=too-few-public-methods)
+        table = "test_reviews"
+
+
+class SomeEnum(Enum):
+    K1 = "V1"
+
+
+class SomeReversedEnum(ReversedEnum):
+    K2 = "V2"
+
+
+class Event(Model):
+    id = fields.IntField(pk=True)
+    name = fields.CharField(255)
+    enum = fields.CharEnumField(SomeEnum)
+    reversed_enum = ReversedCharEnumField(SomeReversedEnum)
+    decimal = fields.DecimalField(20, 2)
+    datetime = fields.DatetimeField()
+    date = fields.DateField()
+    timedelta = fields.TimeDeltaField()
+    bool = fields.BooleanField()
+    count = fields.IntField()
+    note = fields.TextField(null=True)
+
+    class Meta:  # pylint: disable=too-few-public-methods)
+        table = "test_events"
+
+
+class TortoiseConverterDatabaseTest(IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        await Tortoise.init(db_url="sqlite://:memory:", modules={"models": [__name__]})
+        await Tortoise.generate_schemas()
+        self.converter = TortoiseConverter(__name__)
+
+        author = await Author.create(name="author")
+        for book_id in (1, 2):
+            book = await Book.create(id=book_id, title=f"book {book_id}", price=Decimal("9.99"), author=author)
+            await Review.create(rating=book_id, book=book)
+        await Event.create(
+            name="event",
+            enum=SomeEnum.K1,
+            reversed_enum=SomeReversedEnum.K2,
+            decimal=Decimal("1.5"),
+            datetime=datetime(2020, 1, 2, 3, 4, 5),
+            date=date(2020, 1, 2),
+            timedelta=timedelta(seconds=90),
+            bool=True,
+            count=10,
+        )
+
+    async def asyncTearDown(self) -> None:
+        await Tortoise.close_connections()
+
+    def test_prefetch_paths(self):
+        # Act
+        paths = self.converter._get_prefetch_paths(Book, depth=2)
+
+        # Assert
+        self.assertEqual(["author", "reviews"], self.converter._get_prefetch_paths(Book, depth=1))
+        self.assertEqual(["author", "reviews"], paths)
+        self.assertEqual(["books", "books__reviews"], self.converter._get_prefetch_paths(Author, depth=2))
+
+    def test_model_registry(self):
+        # Act
+        registry = TortoiseConverter()._get_model_registry()
+
+        # Assert
+        self.assertIs(Book, registry["models.Book"])
+        self.assertIs(Book, registry["Book"])
+
+    def test_freeze(self):
+        # Act
+        self.converter.freeze(Author)
+
+        # Assert
+        self.assertTrue({Author, Book, Review, list, Decimal} <= set(self.converter._structure_func.dispatch.__self__))
+
+    async def test_unstructure_queryset(self):
+        # Arrange
+        connection = Tortoise.get_connection("default")
+
+        # Act
+        with patch.object(connection, "execute_query", wraps=connection.execute_query) as execute_query:
+            result = await self.converter.unstructure_queryset(Author.all(), depth=2)
+
+        # Assert
+        self.assertEqual(3, execute_query.call_count)
+        self.assertEqual(
+            [
+                {
+                    "id": 1,
+                    "name": "author",
+                    "books": [
+                        {
+                            "id": 1,
+                            "title": "book 1",
+                            "price": "9.99",
+                            "author_id": 1,
+                            "reviews": [{"id": 1, "rating": 1, "book_id": 1}],
+                        },
+                        {
+                            "id": 2,
+                            "title": "book 2",
+                            "price": "9.99",
+                            "author_id": 1,
+                            "reviews": [{"id": 2, "rating": 2, "book_id": 2}],
+                        },
+                    ],
+                }
+            ],
+            result,
+        )
+
+    async def test_unstructure_queryset_projection(self):
+        # Arrange
+        connection = Tortoise.get_connection("default")
+
+        # Act
+        with patch.object(connection, "execute_query", wraps=connection.execute_query) as execute_query:
+            result = await self.converter.unstructure_queryset(Author.all(), include={"name", "books.title", "books.reviews.rating"})
+
+        # Assert
+        self.assertEqual(
+            [
+                'SELECT "id" "id","name" "name" FROM "test_authors"',
+                'SELECT "id" "id","author_id" "author_id","title" "title" FROM "test_books" WHERE "author_id" IN (1)',
+                'SELECT "id" "id","book_id" "book_id","rating" "rating" FROM "test_reviews" WHERE "book_id" IN (1,2)',
+            ],
+            [call.args[0] for call in execute_query.call_args_list],
+        )
+        self.assertEqual(
+            [
+                {
+                    "name": "author",
+                    "books": [{"title": "book 1", "reviews": [{"rating": 1}]}, {"title": "book 2", "reviews": [{"rating": 2}]}],
+                }
+            ],
+            result,
+        )
+
+    async def test_unstructure_projection(self):
+        # Arrange
+        book = await Book.get(id=1).prefetch_related("author", "reviews")
+
+        # Act
+        result = self.converter.unstructure(book, include={"title", "author.name", "reviews"}, exclude={"reviews.book_id"})
+        hook = self.converter._projection_hooks[next(iter(self.converter._projection_hooks))]
+        excluded_result = self.converter.unstructure([book], exclude={"author", "reviews", "price"})
+
+        # Assert
+        self.assertEqual({"title": "book 1", "author": {"name": "author"}, "reviews": [{"id": 1, "rating": 1}]}, result)
+        self.assertEqual([{"id": 1, "title": "book 1", "author_id": 1}], excluded_result)
+        self.converter.unstructure(book, include={"title", "author.name", "reviews"}, exclude={"reviews.book_id"})
+        self.assertIs(hook, self.converter._projection_hooks[next(iter(self.converter._projection_hooks))])
+
+    def test_unstructure_projection_invalid(self):
+        # Act, Assert
+        with self.assertRaises(ValueError) as ctx:
+            self.converter.unstructure(Book(title="book"), include={"title", "name"})
+        self.assertEqual("Cannot unstructure Book: unknown fields name", str(ctx.exception))
+
+        with self.assertRaises(ValueError) as ctx:
+            self.converter.unstructure(Book(title="book"), include={"title.name"})
+        self.assertEqual('Cannot unstructure Book: "title" field is not a relation', str(ctx.exception))
+
+    async def test_unstructure_queryset_memo(self):
+        # Act
+        result = await self.converter.unstructure_queryset(Book.all().order_by("id"), memo="reuse")
+
+        # Assert
+        self.assertEqual({"id": 1, "name": "author"}, result[0]["author"])
+        self.assertIs(result[0]["author"], result[1]["author"])
+
+    async def test_iter_unstructure_queryset_batches(self):
+        # Act
+        result = [item async for item in self.converter.iter_unstructure_queryset(Book.all().order_by("id"), batch_size=1)]
+
+        # Assert
+        self.assertEqual([1, 2], [item["id"] for item in result])
+        self.assertEqual([{"id": 1, "name": "author"}, {"id": 1, "name": "author"}], [item["author"] for item in result])
+        self.assertEqual(
+            [[{"id": 1, "rating": 1, "book_id": 1}], [{"id": 2, "rating": 2, "book_id": 2}]], [item["reviews"] for item in result]
+        )
+
+    async def test_iter_unstructure_queryset_to(self):
+        # Arrange
+        fp = io.StringIO()
+
+        # Act
+        written = await self.converter.iter_unstructure_queryset_to(fp, Book.all().order_by("id"), depth=0, batch_size=1)
+
+        # Assert
+        self.assertEqual(2, written)
+        self.assertEqual([1, 2], [json.loads(line)["id"] for line in fp.getvalue().splitlines()])
+
+    async def test_unstructure_values(self):
+        # Act
+        with patch.object(Event, "_init_from_db") as init_from_db:
+            result = await self.converter.unstructure_values(Event.all())
+            books = [item async for item in self.converter.iter_unstructure_values(Book.all().order_by("id"), batch_size=1)]
+
+        # Assert
+        init_from_db.assert_not_called()
+        self.assertEqual(await self.converter.unstructure_queryset(Event.all(), depth=0), result)
+        self.assertEqual(
+            [
+                {
+                    "id": 1,
+                    "name": "event",
+                    "enum": "V1",
+                    "reversed_enum": "K2",
+                    "decimal": "1.5",
+                    "datetime": 1577934245.0,
+                    "date": 1577923200.0,
+                    "timedelta": 90.0,
+                    "bool": True,
+                    "count": 10,
+                    "note": None,
+                }
+            ],
+            result,
+        )
+        self.assertEqual(await self.converter.unstructure_queryset(Book.all().order_by("id"), depth=0), books)
+
+    async def test_unstructure_values_projection(self):
+        # Act
+        result = await self.converter.unstructure_values(Book.all().order_by("id"), include={"title", "price"})
+        excluded_result = await self.converter.unstructure_values(Book.all().order_by("id"), exclude={"price", "author_id"})
+
+        # Assert
+        self.assertEqual([{"title": "book 1", "price": "9.99"}, {"title": "book 2", "price": "9.99"}], result)
+        self.assertEqual([{"id": 1, "title": "book 1"}, {"id": 2, "title": "book 2"}], excluded_result)
+        with self.assertRaises(ValueError) as ctx:
+            await self.converter.unstructure_values(Book.all(), include={"title", "author.name"})
+        self.assertEqual('Cannot unstructure Book: "author" field can\'t be fetched as values', str(ctx.exception))
+
+    async def test_load_into_db(self):
+        # Arrange
+        authors = [{"id": 2, "name": "another author"}]
+        books = (
+            {"id": 10 + i, "title": f"book {10 + i}", "price": "1.5", "author": {"id": 2, "name": "another author"}}
+            if i % 2
+            else {"id": 10 + i, "title": f"book {10 + i}", "author_id": 1}
+            for i in range(5)
+        )
+        connection = Tortoise.get_connection("default")
+
+        # Act
+        authors_count = await self.converter.load_into_db(authors, Author)
+        with patch.object(connection, "execute_many", wraps=connection.execute_many) as execute_many:
+            books_count = await self.converter.load_into_db(books, Book, batch_size=2)
+
+        # Assert
+        self.assertEqual((1, 5), (authors_count, books_count))
+        self.assertEqual(3, execute_many.call_count)
+        self.assertEqual(
+            [(10, 1, None), (11, 2, Decimal("1.5")), (12, 1, None), (13, 2, Decimal("1.5")), (14, 1, None)],
+            await Book.filter(id__gte=10).order_by("id").values_list("id", "author_id", "price"),
+        )
+
+    async def test_load_into_db_errors(self):
+        # Arrange
+        books = [
+            {"id": 10, "title": "book 10", "author_id": 1},
+            {"id": 11, "title": "book 11", "author_id": 1},
+            {"id": 12, "author_id": 1},
+            {"id": 13, "title": "book 13"},
+            {"id": 14, "title": "book 14", "author": {"name": "new author"}},
+        ]
+
+        # Act, Assert
+        with self.assertRaises(BatchStructureError) as ctx:
+            await self.converter.load_into_db(books, Book, batch_size=2)
+        self.assertEqual([2, 3], list(ctx.exception.errors))
+        self.assertEqual(2, await Book.filter(id__gte=10).count())
+
+        with self.assertRaises(StructureError) as ctx:
+            await self.converter.load_into_db(books[4:], Book)
+        self.assertEqual('Cannot structure Book: item 0 doesn\'t reference an existing row in "author"', str(ctx.exception))
+
+        with self.assertRaises(StructureError) as ctx:
+            await self.converter.load_into_db([books[0], {"id": 15, "title": "book 15", "author_id": 3}], Book)
+        self.assertEqual('Cannot structure Book: item 1 doesn\'t reference an existing row in "author"', str(ctx.exception))
+        self.assertEqual(2, await Book.filter(id__gte=10).count())